@@ -0,0 +1,158 @@
+import mmap
+import os
+import struct
+import threading
+from datetime import datetime
+from typing import Dict, Optional
+
+from board_generator import localizar_palabra
+from config import BOARD_SIZE
+from data_storage import Tablero
+
+MAGIA = b"SOPA"
+VERSION = 2
+CABECERA_ARCHIVO = struct.Struct("<4sHHHH")       # magia, versión, lado, max_palabras, max_largo
+CABECERA_REGISTRO = struct.Struct("<Id16sB")       # id, fecha (timestamp), categoría, cantidad de palabras
+SIN_COLOCACION = 255
+
+
+class ArchivoTableros:
+    """
+    Archivo de solo anexado con tableros codificados en registros de tamaño fijo.
+    Se lee con mmap: los tableros archivados no ocupan memoria de Python y se
+    decodifican bajo demanda a partir del índice id -> posición del registro.
+
+    Registro: cabecera (id, fecha, categoría) | lado*lado letras (latin-1) | max_palabras ranuras de
+    (largo, texto[max_largo], fila, col, dir_fila, dir_col).
+    """
+
+    def __init__(self, ruta: str, lado: int = BOARD_SIZE, max_palabras: int = 32, max_largo: int = 24):
+        self.ruta = ruta
+        self._lock = threading.Lock()
+        self._indice: Dict[int, int] = {}
+        self._mapa: Optional[mmap.mmap] = None
+        self._mapeados = 0
+
+        nuevo = not os.path.exists(ruta) or os.path.getsize(ruta) == 0
+        self._archivo = open(ruta, "a+b")
+        if nuevo:
+            self._archivo.write(CABECERA_ARCHIVO.pack(MAGIA, VERSION, lado, max_palabras, max_largo))
+            self._archivo.flush()
+        else:
+            self._archivo.seek(0)
+            magia, version, lado, max_palabras, max_largo = CABECERA_ARCHIVO.unpack(
+                self._archivo.read(CABECERA_ARCHIVO.size))
+            if magia != MAGIA or version != VERSION:
+                raise ValueError(f"{ruta} no es un archivo de tableros válido")
+
+        self.lado = lado
+        self.max_palabras = max_palabras
+        self.max_largo = max_largo
+        self._ranura = struct.Struct(f"<B{max_largo}sBBbb")
+        self.tamano_registro = CABECERA_REGISTRO.size + lado * lado + max_palabras * self._ranura.size
+
+        self._cargar_indice()
+
+    def _cargar_indice(self):
+        """Reconstruye el índice leyendo solo el id de cada registro"""
+        total = (os.path.getsize(self.ruta) - CABECERA_ARCHIVO.size) // self.tamano_registro
+        self._remapear()
+        for posicion in range(total):
+            inicio = CABECERA_ARCHIVO.size + posicion * self.tamano_registro
+            tablero_id = struct.unpack_from("<I", self._mapa, inicio)[0]
+            self._indice[tablero_id] = posicion
+
+    def _remapear(self):
+        """Vuelve a mapear el archivo completo tras anexar registros"""
+        self._archivo.flush()
+        tamano = os.path.getsize(self.ruta)
+        if self._mapa is not None:
+            self._mapa.close()
+        self._mapa = mmap.mmap(self._archivo.fileno(), tamano, access=mmap.ACCESS_READ)
+        self._mapeados = tamano
+
+    def __len__(self):
+        return len(self._indice)
+
+    def __contains__(self, tablero_id):
+        return tablero_id in self._indice
+
+    @property
+    def ultimo_id(self) -> int:
+        """Mayor id archivado (0 si el archivo está vacío)"""
+        return max(self._indice, default=0)
+
+    def codificar(self, tablero: Tablero) -> bytes:
+        """Codifica un tablero en un registro de tamaño fijo"""
+        if len(tablero.matriz) != self.lado or len(tablero.palabras) > self.max_palabras:
+            raise ValueError(f"El tablero {tablero.id} no cabe en el formato del archivo")
+
+        partes = [
+            CABECERA_REGISTRO.pack(tablero.id, tablero.fecha_creacion.timestamp(),
+                                   tablero.categoria.encode("latin-1"), len(tablero.palabras)),
+            "".join("".join(fila) for fila in tablero.matriz).encode("latin-1")
+        ]
+        colocaciones = tablero.colocaciones or {}
+        for palabra in tablero.palabras:
+            texto = palabra.encode("latin-1")
+            if len(texto) > self.max_largo:
+                raise ValueError(f"La palabra {palabra} excede {self.max_largo} letras")
+            colocacion = colocaciones.get(palabra) or localizar_palabra(tablero.matriz, palabra)
+            fila, col, dir_fila, dir_col = colocacion or (SIN_COLOCACION, SIN_COLOCACION, 0, 0)
+            partes.append(self._ranura.pack(len(texto), texto, fila, col, dir_fila, dir_col))
+
+        registro = b"".join(partes)
+        return registro.ljust(self.tamano_registro, b"\0")
+
+    def agregar(self, tablero: Tablero):
+        """Anexa un tablero al final del archivo"""
+        registro = self.codificar(tablero)
+        with self._lock:
+            if tablero.id in self._indice:
+                raise ValueError(f"El tablero {tablero.id} ya está archivado")
+            self._archivo.seek(0, os.SEEK_END)
+            posicion = (self._archivo.tell() - CABECERA_ARCHIVO.size) // self.tamano_registro
+            self._archivo.write(registro)
+            self._archivo.flush()
+            self._indice[tablero.id] = posicion
+
+    def obtener(self, tablero_id: int) -> Optional[Tablero]:
+        """Decodifica un tablero del archivo, o None si no está archivado"""
+        posicion = self._indice.get(tablero_id)
+        if posicion is None:
+            return None
+
+        inicio = CABECERA_ARCHIVO.size + posicion * self.tamano_registro
+        with self._lock:
+            if inicio + self.tamano_registro > self._mapeados:
+                self._remapear()
+            registro = self._mapa[inicio:inicio + self.tamano_registro]
+
+        tablero_id, fecha, categoria, cantidad = CABECERA_REGISTRO.unpack_from(registro, 0)
+        desplazamiento = CABECERA_REGISTRO.size
+        letras = registro[desplazamiento:desplazamiento + self.lado * self.lado].decode("latin-1")
+        matriz = [list(letras[i:i + self.lado]) for i in range(0, len(letras), self.lado)]
+        desplazamiento += self.lado * self.lado
+
+        palabras = []
+        colocaciones = {}
+        for _ in range(cantidad):
+            largo, texto, fila, col, dir_fila, dir_col = self._ranura.unpack_from(registro, desplazamiento)
+            desplazamiento += self._ranura.size
+            palabra = texto[:largo].decode("latin-1")
+            palabras.append(palabra)
+            if fila != SIN_COLOCACION:
+                colocaciones[palabra] = (fila, col, dir_fila, dir_col)
+
+        tablero = Tablero(tablero_id, matriz, palabras, colocaciones,
+                          categoria=categoria.rstrip(b"\0").decode("latin-1"))
+        tablero.fecha_creacion = datetime.fromtimestamp(fecha)
+        return tablero
+
+    def cerrar(self):
+        """Libera el mapa y el descriptor del archivo"""
+        with self._lock:
+            if self._mapa is not None:
+                self._mapa.close()
+                self._mapa = None
+            self._archivo.close()
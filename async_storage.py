@@ -0,0 +1,118 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+
+from config import TOP_LIDERES
+
+
+class AsyncStorage:
+    """
+    Fachada async sobre un storage síncrono (DataStorage, SQLiteStorage...).
+    Los backends bloqueantes se ejecutan en un executor dedicado y las lecturas
+    concurrentes del mismo ID comparten una única consulta.
+    """
+
+    def __init__(self, storage, max_workers: int = 4):
+        self.storage = storage
+        self.bloqueante = getattr(storage, "es_bloqueante", True)
+        self._executor = (
+            ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="storage")
+            if self.bloqueante else None
+        )
+        self._lecturas_en_curso: Dict[Tuple[str, object], asyncio.Future] = {}
+
+    async def _ejecutar(self, metodo, *args, **kwargs):
+        """Ejecuta un método del storage sin bloquear el event loop"""
+        if not self.bloqueante:
+            return metodo(*args, **kwargs)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(metodo, *args, **kwargs))
+
+    async def _leer(self, nombre: str, clave):
+        """Lectura por clave; las llamadas simultáneas esperan la misma consulta"""
+        metodo = getattr(self.storage, nombre)
+        if not self.bloqueante:
+            return metodo(clave)
+
+        llave = (nombre, clave)
+        futuro = self._lecturas_en_curso.get(llave)
+        if futuro is None:
+            futuro = asyncio.ensure_future(self._ejecutar(metodo, clave))
+            self._lecturas_en_curso[llave] = futuro
+            futuro.add_done_callback(lambda f: self._olvidar(llave, f))
+        return await asyncio.shield(futuro)
+
+    def _olvidar(self, llave, futuro):
+        if self._lecturas_en_curso.get(llave) is futuro:
+            del self._lecturas_en_curso[llave]
+
+    # ---------------- Palabras ----------------
+
+    async def agregar_palabra(self, texto: str, categoria: str = "PROFESIONES"):
+        return await self._ejecutar(self.storage.agregar_palabra, texto, categoria)
+
+    async def obtener_palabras(self, categoria: str = None) -> List[str]:
+        return await self._leer("obtener_palabras", categoria)
+
+    async def muestrear_palabras(self, categoria: str, cantidad: int) -> List[str]:
+        # Cada llamada debe dar una muestra distinta: no se comparte la lectura
+        return await self._ejecutar(self.storage.muestrear_palabras, categoria, cantidad)
+
+    async def obtener_categorias(self) -> Dict[str, int]:
+        return await self._ejecutar(self.storage.obtener_categorias)
+
+    async def buscar_palabra(self, texto: str):
+        return await self._leer("buscar_palabra", texto)
+
+    # ---------------- Tableros ----------------
+
+    async def guardar_tablero(self, matriz: List[List[str]], palabras: List[str],
+                              categoria: str = "PROFESIONES") -> int:
+        return await self._ejecutar(self.storage.guardar_tablero, matriz, palabras, categoria)
+
+    async def obtener_tablero(self, tablero_id: int):
+        return await self._leer("obtener_tablero", tablero_id)
+
+    async def listar_tableros(self):
+        return await self._ejecutar(self.storage.listar_tableros)
+
+    # ---------------- Juegos ----------------
+
+    async def crear_juego(self, tablero_id: int) -> int:
+        return await self._ejecutar(self.storage.crear_juego, tablero_id)
+
+    async def obtener_juego(self, juego_id: int):
+        return await self._leer("obtener_juego", juego_id)
+
+    async def actualizar_juego(self, juego_id: int, palabra_encontrada: str = None, finalizar: bool = False,
+                               palabras_encontradas: List[str] = None):
+        # Una lectura iniciada antes de la escritura no debe servirse a lectores posteriores
+        self._lecturas_en_curso.pop(("obtener_juego", juego_id), None)
+        try:
+            return await self._ejecutar(self.storage.actualizar_juego, juego_id,
+                                        palabra_encontrada=palabra_encontrada, finalizar=finalizar,
+                                        palabras_encontradas=palabras_encontradas)
+        finally:
+            self._lecturas_en_curso.pop(("obtener_juego", juego_id), None)
+
+    async def listar_juegos(self):
+        return await self._ejecutar(self.storage.listar_juegos)
+
+    async def obtener_lideres(self, tablero_id: int = None, categoria: str = None,
+                              cantidad: int = TOP_LIDERES):
+        return await self._ejecutar(self.storage.obtener_lideres, tablero_id=tablero_id,
+                                    categoria=categoria, cantidad=cantidad)
+
+    # ---------------- Utilidades ----------------
+
+    async def obtener_estadisticas(self):
+        return await self._ejecutar(self.storage.obtener_estadisticas)
+
+    async def exportar_datos(self, archivo: str = "datos_juego.json"):
+        return await self._ejecutar(self.storage.exportar_datos, archivo)
+
+    def cerrar(self, esperar: bool = True):
+        """Detiene el executor dedicado"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=esperar)
@@ -0,0 +1,541 @@
+"""
+Benchmarks locales del servidor de Sopa de Letras.
+
+Uso:
+    python benchmarks.py workers --workers 1 2 4
+    python benchmarks.py salas --jugadores 1000 2000
+    python benchmarks.py dificultad --tableros 200
+    python benchmarks.py arranque --tableros 0 5000
+    python benchmarks.py lideres --juegos 1000000
+    python benchmarks.py apagado --conexiones 100 1000
+    python benchmarks.py compresion --muestras 200
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import resource
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+from datetime import datetime, timedelta
+
+import websockets
+
+from board_generator import generar_tablero_garantizado, generar_tablero_por_dificultad
+from config import DIFICULTADES
+from data_storage import PALABRAS_DEFAULT, DataStorage
+from ws_client import ClienteSopa, _percentil
+
+
+# ================================================================
+# UTILIDADES
+# ================================================================
+def esperar_puerto(host, port, timeout=15.0):
+    """Espera hasta que el puerto acepte conexiones TCP"""
+    limite = time.monotonic() + timeout
+    while time.monotonic() < limite:
+        try:
+            with socket.create_connection((host, port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.05)
+    raise TimeoutError(f"El servidor no abrió {host}:{port}")
+
+
+def lanzar_servidor(port, *argumentos, directorio=None):
+    """Lanza ws_server.py en su propio grupo de procesos"""
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ws_server.py")
+    proceso = subprocess.Popen(
+        [sys.executable, script, "--puerto", str(port), *argumentos],
+        cwd=directorio,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        start_new_session=True
+    )
+    esperar_puerto("localhost", port)
+    return proceso
+
+
+def subir_limite_archivos():
+    """Sube el límite de descriptores abiertos al máximo permitido"""
+    _, maximo = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (maximo, maximo))
+
+
+def detener_servidor(proceso):
+    """Envía Ctrl+C a todo el grupo del servidor y espera su salida"""
+    os.killpg(proceso.pid, signal.SIGINT)
+    try:
+        proceso.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        os.killpg(proceso.pid, signal.SIGKILL)
+        proceso.wait()
+
+
+# ================================================================
+# BENCHMARK: ESCALADO POR WORKERS
+# ================================================================
+async def _ciclos_conexion(uri, duracion, concurrencia, comando):
+    """Abre, usa y cierra conexiones en bucle durante `duracion` segundos"""
+    limite = time.monotonic() + duracion
+    completadas = 0
+    errores = 0
+
+    async def bucle():
+        nonlocal completadas, errores
+        while time.monotonic() < limite:
+            try:
+                async with ClienteSopa(uri) as cliente:
+                    await cliente.enviar_comando(comando)
+                completadas += 1
+            except Exception:
+                errores += 1
+
+    await asyncio.gather(*(bucle() for _ in range(concurrencia)))
+    return completadas, errores
+
+
+def _generador_carga(argumentos):
+    return asyncio.run(_ciclos_conexion(*argumentos))
+
+
+def bench_workers(args):
+    """Mide conexiones/seg según el número de workers del servidor"""
+    uri = f"ws://localhost:{args.puerto}"
+    print(f"CPUs disponibles: {os.cpu_count()}  |  comando por conexión: {args.comando}")
+    print(f"{'WORKERS':>8}{'CONEXIONES':>12}{'ERRORES':>9}{'CONN/S':>10}")
+
+    for workers in args.workers:
+        with tempfile.TemporaryDirectory() as directorio:
+            servidor = lanzar_servidor(args.puerto, "--workers", str(workers),
+                                       "--db", os.path.join(directorio, "bench.db"),
+                                       directorio=directorio)
+            try:
+                tareas = [(uri, args.duracion, args.concurrencia, args.comando)] * args.generadores
+                with multiprocessing.Pool(args.generadores) as pool:
+                    resultados = pool.map(_generador_carga, tareas)
+            finally:
+                detener_servidor(servidor)
+
+        completadas = sum(r[0] for r in resultados)
+        errores = sum(r[1] for r in resultados)
+        print(f"{workers:>8}{completadas:>12}{errores:>9}{completadas / args.duracion:>10.1f}")
+
+
+# ================================================================
+# BENCHMARK: DIFUSIÓN EN SALAS
+# ================================================================
+async def _conectar_jugadores(uri, jugadores, sala, lote=200):
+    """Conecta jugadores por lotes y los une a la misma sala"""
+    clientes = []
+    for inicio in range(0, jugadores, lote):
+        nuevos = [ClienteSopa(uri) for _ in range(min(lote, jugadores - inicio))]
+        await asyncio.gather(*(c.conectar() for c in nuevos))
+        await asyncio.gather(*(c.unirse(sala) for c in nuevos))
+        clientes.extend(nuevos)
+    return clientes
+
+
+async def _medir_difusion(uri, jugadores, rondas):
+    """Latencia desde un ENCONTRAR hasta que cada miembro recibe el evento"""
+    clientes = await _conectar_jugadores(uri, jugadores, "bench")
+    try:
+        emisor = clientes[0]
+        palabras = emisor.juego["palabras"][:rondas]
+        latencias = []
+        completas = []
+
+        for palabra in palabras:
+            async def recibir(cliente):
+                await cliente.recibir_evento()
+                return time.perf_counter()
+
+            receptores = [asyncio.create_task(recibir(c)) for c in clientes[1:]]
+            inicio = time.perf_counter()
+            await emisor.encontrar(palabra)
+            llegadas = await asyncio.gather(*receptores)
+            emisor.eventos.clear()
+
+            ronda = sorted(t - inicio for t in llegadas)
+            latencias.extend(ronda)
+            completas.append(ronda[-1])
+        return sorted(latencias), completas
+    finally:
+        await asyncio.gather(*(c.cerrar() for c in clientes), return_exceptions=True)
+
+
+def bench_salas(args):
+    """Mide la latencia de difusión para salas de distintos tamaños"""
+    subir_limite_archivos()
+    uri = f"ws://localhost:{args.puerto}"
+    print("Latencia (ms) desde el envío hasta la recepción en cada jugador")
+    print(f"{'JUGADORES':>10}{'P50':>10}{'P99':>10}{'MAX':>10}{'RONDA':>10}")
+
+    for jugadores in args.jugadores:
+        with tempfile.TemporaryDirectory() as directorio:
+            servidor = lanzar_servidor(args.puerto, directorio=directorio)
+            try:
+                latencias, completas = asyncio.run(_medir_difusion(uri, jugadores, args.rondas))
+            finally:
+                detener_servidor(servidor)
+
+        ronda_media = sum(completas) / len(completas)
+        print(f"{jugadores:>10}{_percentil(latencias, 50) * 1000:>10.2f}"
+              f"{_percentil(latencias, 99) * 1000:>10.2f}{latencias[-1] * 1000:>10.2f}"
+              f"{ronda_media * 1000:>10.2f}")
+
+
+# ================================================================
+# BENCHMARK: GENERACIÓN POR DIFICULTAD
+# ================================================================
+def _silenciar_prints():
+    """El generador imprime su progreso; no debe contar en los tiempos"""
+    import builtins
+    original = builtins.print
+    builtins.print = lambda *a, **k: None
+    return lambda: setattr(builtins, "print", original)
+
+
+def bench_dificultad(args):
+    """Tiempo de generación y puntuación obtenida por nivel de dificultad"""
+    print(f"{args.tableros} tableros de {len(PALABRAS_DEFAULT)} palabras por nivel")
+    print(f"{'NIVEL':>10}{'OBJETIVO':>10}{'MEDIA':>8}{'DESV':>8}{'MEDIA ms':>10}{'P95 ms':>10}")
+
+    restaurar = _silenciar_prints()
+    try:
+        resultados = []
+        tiempos = []
+        for _ in range(args.tableros):
+            inicio = time.perf_counter()
+            generar_tablero_garantizado(PALABRAS_DEFAULT)
+            tiempos.append(time.perf_counter() - inicio)
+        resultados.append(("SIN NIVEL", None, [], sorted(tiempos)))
+
+        for nivel, objetivo in DIFICULTADES.items():
+            puntuaciones = []
+            tiempos = []
+            for _ in range(args.tableros):
+                inicio = time.perf_counter()
+                _, _, dificultad = generar_tablero_por_dificultad(PALABRAS_DEFAULT, nivel)
+                tiempos.append(time.perf_counter() - inicio)
+                if dificultad["puntuacion"] is not None:
+                    puntuaciones.append(dificultad["puntuacion"])
+            resultados.append((nivel, objetivo, puntuaciones, sorted(tiempos)))
+    finally:
+        restaurar()
+
+    for nivel, objetivo, puntuaciones, tiempos in resultados:
+        if puntuaciones:
+            media = sum(puntuaciones) / len(puntuaciones)
+            desviacion = (sum((p - media) ** 2 for p in puntuaciones) / len(puntuaciones)) ** 0.5
+            columnas = f"{objetivo:>10.2f}{media:>8.3f}{desviacion:>8.3f}"
+        else:
+            columnas = f"{'-':>10}{'-':>8}{'-':>8}"
+        print(f"{nivel:>10}{columnas}{sum(tiempos) / len(tiempos) * 1000:>10.2f}"
+              f"{_percentil(tiempos, 95) * 1000:>10.2f}")
+
+
+# ================================================================
+# BENCHMARK: ARRANQUE
+# ================================================================
+async def _primera_respuesta(uri, timeout=30.0):
+    """Reintenta hasta obtener respuesta a ESTADISTICAS"""
+    limite = time.monotonic() + timeout
+    while True:
+        try:
+            async with ClienteSopa(uri) as cliente:
+                return await cliente.estadisticas()
+        except OSError:
+            if time.monotonic() > limite:
+                raise
+            await asyncio.sleep(0.005)
+
+
+def _crear_snapshot(archivo, cantidad):
+    """Genera `cantidad` tableros y los guarda como snapshot"""
+    restaurar = _silenciar_prints()
+    try:
+        storage = DataStorage()
+        for _ in range(cantidad):
+            tablero, palabras = generar_tablero_garantizado(PALABRAS_DEFAULT)
+            storage.guardar_tablero(tablero, palabras)
+        storage.guardar_snapshot(archivo, tableros_recientes=cantidad)
+    finally:
+        restaurar()
+
+
+def bench_arranque(args):
+    """Tiempo hasta aceptar conexiones y hasta responder, según el tamaño del snapshot"""
+    uri = f"ws://localhost:{args.puerto}"
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ws_server.py")
+    print(f"{'TABLEROS':>9}{'ACCEPT ms':>11}{'RESTAURAR ms':>14}{'1a RESPUESTA ms':>17}")
+
+    for cantidad in args.tableros:
+        with tempfile.TemporaryDirectory() as directorio:
+            snapshot = os.path.join(directorio, "snapshot.pkl")
+            _crear_snapshot(snapshot, cantidad)
+
+            inicio = time.perf_counter()
+            servidor = subprocess.Popen(
+                [sys.executable, script, "--puerto", str(args.puerto), "--snapshot", snapshot],
+                cwd=directorio, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                start_new_session=True
+            )
+            try:
+                estadisticas = asyncio.run(_primera_respuesta(uri))
+                respuesta_ms = (time.perf_counter() - inicio) * 1000
+            finally:
+                detener_servidor(servidor)
+
+        arranque = estadisticas["servidor"]["arranque"]
+        print(f"{cantidad:>9}{arranque['escucha_ms']:>11.1f}"
+              f"{arranque['restauracion_ms']:>14.1f}{respuesta_ms:>17.1f}")
+
+
+# ================================================================
+# BENCHMARK: LIDERES
+# ================================================================
+def _medir(funcion, repeticiones):
+    """Tiempo medio (µs) de una llamada"""
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion()
+    return (time.perf_counter() - inicio) / repeticiones * 1e6
+
+
+def bench_lideres(args):
+    """Costo de ESTADISTICAS y LIDERES con muchos juegos terminados"""
+    categorias = ["PROFESIONES", "ANIMALES", "PAISES", "FRUTAS"]
+    storage = DataStorage()
+    tableros = [
+        storage.guardar_tablero([['A', 'B'], ['C', 'D']], ["AB", "CD"], categorias[i % len(categorias)])
+        for i in range(args.tableros)
+    ]
+
+    aleatorio = random.Random(7)
+    ahora = datetime.now()
+    inicio = time.perf_counter()
+    for i in range(args.juegos):
+        juego_id = storage.crear_juego(tableros[i % len(tableros)])
+        storage.obtener_juego(juego_id).tiempo_inicio = ahora - timedelta(seconds=aleatorio.uniform(30, 3600))
+        # Uno de cada diez se resuelve sin encontrar todo: no entra en las clasificaciones
+        encontradas = ["AB"] if i % 10 == 0 else ["AB", "CD"]
+        storage.actualizar_juego(juego_id, palabras_encontradas=encontradas, finalizar=True)
+    carga = time.perf_counter() - inicio
+    print(f"{args.juegos} juegos terminados en {carga:.1f} s "
+          f"({carga / args.juegos * 1e6:.1f} µs por juego, incluye crear y finalizar)")
+
+    consultas = [
+        ("ESTADISTICAS (contadores)", storage.obtener_estadisticas, 10000),
+        ("ESTADISTICAS (sum previo)", lambda: sum(1 for j in storage.juegos if j.completado), 3),
+        ("LIDERES global", storage.obtener_lideres, 10000),
+        ("LIDERES tablero", lambda: storage.obtener_lideres(tablero_id=tableros[1]), 10000),
+        ("LIDERES categoria", lambda: storage.obtener_lideres(categoria="ANIMALES"), 10000),
+        ("LIDERES ordenando todo", lambda: sorted(
+            (j.get_tiempo_transcurrido(), j.id) for j in storage.juegos if j.completado)[:10], 1)
+    ]
+    print(f"{'CONSULTA':<28}{'µs':>14}")
+    for nombre, funcion, repeticiones in consultas:
+        print(f"{nombre:<28}{_medir(funcion, repeticiones):>14.1f}")
+
+
+# ================================================================
+# BENCHMARK: APAGADO
+# ================================================================
+async def _esperar_cierre(cliente, comando=None):
+    """Envía un comando opcional y lee hasta el cierre; retorna (respondido, código de cierre)"""
+    respondido = False
+    if comando:
+        await cliente.websocket.send(json.dumps(comando))
+    try:
+        while True:
+            datos = json.loads(await cliente.websocket.recv())
+            respondido = respondido or "error" not in datos
+    except websockets.exceptions.ConnectionClosed as e:
+        return respondido, e.rcvd.code if e.rcvd else None
+
+
+async def _apagar_con_clientes(uri, proceso, conexiones, ocupados):
+    """Conecta clientes con juegos activos y apaga el servidor con comandos en curso"""
+    clientes = []
+    for inicio in range(0, conexiones, 200):
+        nuevos = [ClienteSopa(uri) for _ in range(min(200, conexiones - inicio))]
+        await asyncio.gather(*(c.conectar() for c in nuevos))
+        await asyncio.gather(*(c.start(cantidad=5) for c in nuevos))
+        clientes.extend(nuevos)
+
+    comando = {"comando": "START", "dificultad": "DIFICIL"}
+    tareas = [
+        asyncio.create_task(_esperar_cierre(c, comando if i < ocupados else None))
+        for i, c in enumerate(clientes)
+    ]
+    await asyncio.sleep(0.005)  # Los START ocupados ya llegaron al servidor
+
+    inicio = time.perf_counter()
+    os.killpg(proceso.pid, signal.SIGINT)
+    resultados = await asyncio.gather(*tareas)
+    cierre = time.perf_counter() - inicio
+    await asyncio.to_thread(proceso.wait, 30)
+    return resultados, cierre, time.perf_counter() - inicio
+
+
+def bench_apagado(args):
+    """Tiempo de apagado ordenado y comandos drenados según las conexiones abiertas"""
+    subir_limite_archivos()
+    uri = f"ws://localhost:{args.puerto}"
+    print(f"{'CONEXIONES':>11}{'OCUPADAS':>10}{'DRENADAS':>10}{'1001':>7}{'CIERRE ms':>11}"
+          f"{'SALIDA ms':>11}{'CHECKPOINT':>12}")
+
+    for conexiones in args.conexiones:
+        ocupados = min(args.ocupados, conexiones)
+        with tempfile.TemporaryDirectory() as directorio:
+            proceso = lanzar_servidor(args.puerto, directorio=directorio)
+            try:
+                resultados, cierre, salida = asyncio.run(
+                    _apagar_con_clientes(uri, proceso, conexiones, ocupados))
+            finally:
+                if proceso.poll() is None:
+                    detener_servidor(proceso)
+            checkpoint = os.path.join(directorio, "checkpoint_juegos.jsonl")
+            registros = sum(1 for _ in open(checkpoint)) if os.path.exists(checkpoint) else 0
+
+        drenadas = sum(1 for respondido, _ in resultados[:ocupados] if respondido)
+        codigos_1001 = sum(1 for _, codigo in resultados if codigo == 1001)
+        print(f"{conexiones:>11}{ocupados:>10}{drenadas:>10}{codigos_1001:>7}{cierre * 1000:>11.1f}"
+              f"{salida * 1000:>11.1f}{registros:>12}")
+
+
+# ================================================================
+# BENCHMARK: COMPRESION
+# ================================================================
+CONFIGURACIONES_DEFLATE = [
+    # (nombre, bits de ventana, memLevel, nivel, contexto compartido entre mensajes)
+    ("defecto ws (12/5/6)", 12, 5, 6, True),
+    ("ventana 9", 9, 5, 6, True),
+    ("ventana 15", 15, 8, 6, True),
+    ("nivel 1", 12, 5, 1, True),
+    ("nivel 9", 12, 5, 9, True),
+    ("ventana 10 / mem 4", 10, 4, 6, True),
+    ("nivel 1 ventana 10", 10, 4, 1, True),
+    ("sin contexto", 12, 5, 6, False),
+]
+
+
+def _cargas_de_juego(muestras):
+    """Respuestas reales de START, RESOLVER y ENCONTRAR para `muestras` juegos"""
+    import game_logic
+    restaurar = _silenciar_prints()
+    try:
+        game_logic.configurar_storage(DataStorage())
+        cargas = {"START": [], "ENCONTRAR": [], "RESOLVER": []}
+        for _ in range(muestras):
+            paquete = game_logic.crear_juego()
+            datos = json.loads(paquete)
+            cargas["START"].append(paquete.encode())
+            cargas["ENCONTRAR"].append(
+                game_logic.actualizar_progreso(datos["juego_id"], datos["palabras"][0]).encode())
+            cargas["RESOLVER"].append(
+                game_logic.resolver_juego(datos["juego_id"], datos["tablero_id"]).encode())
+    finally:
+        restaurar()
+    return cargas
+
+
+def _comprimir_conexiones(cargas, bits, memoria, nivel, contexto):
+    """
+    Comprime como PerMessageDeflate: cada juego es una conexión (START, ENCONTRAR,
+    RESOLVER) con su propio compresor. Retorna {comando: (bytes enviados, segundos)}.
+    """
+    resultado = {comando: [0, 0.0] for comando in cargas}
+    for mensajes in zip(*cargas.values()):
+        codificador = zlib.compressobj(level=nivel, wbits=-bits, memLevel=memoria)
+        for comando, mensaje in zip(cargas, mensajes):
+            inicio = time.perf_counter()
+            if not contexto:
+                codificador = zlib.compressobj(level=nivel, wbits=-bits, memLevel=memoria)
+            enviados = len(codificador.compress(mensaje) + codificador.flush(zlib.Z_SYNC_FLUSH)) - 4
+            resultado[comando][0] += enviados
+            resultado[comando][1] += time.perf_counter() - inicio
+    return resultado
+
+
+def bench_compresion(args):
+    """Costo de CPU frente a bytes ahorrados por per-message-deflate, por tipo de respuesta"""
+    cargas = _cargas_de_juego(args.muestras)
+    print(f"{args.muestras} conexiones con START, ENCONTRAR y RESOLVER (zlib como per-message-deflate)")
+    print(f"{'CONFIGURACION':<22}{'KB/CONEX':>9}  {'COMANDO':<10}{'BYTES':>7}{'ENVIADOS':>10}{'PROP':>7}"
+          f"{'µs/MSG':>9}{'µs/KB AHORRADO':>16}")
+
+    for nombre, bits, memoria, nivel, contexto in CONFIGURACIONES_DEFLATE:
+        # Memoria del compresor que se mantiene por conexión si se comparte el contexto
+        memoria_kb = ((1 << (bits + 2)) + (1 << (memoria + 9))) // 1024 if contexto else 0
+        resultado = _comprimir_conexiones(cargas, bits, memoria, nivel, contexto)
+        for comando, mensajes in cargas.items():
+            originales = sum(len(m) for m in mensajes)
+            enviados, segundos = resultado[comando]
+            ahorrado_kb = (originales - enviados) / 1024
+            costo = segundos * 1e6 / ahorrado_kb if ahorrado_kb > 0 else float("inf")
+            print(f"{nombre:<22}{memoria_kb:>9}  {comando:<10}{originales // len(mensajes):>7}"
+                  f"{enviados // len(mensajes):>10}{enviados / originales:>7.2f}"
+                  f"{segundos * 1e6 / len(mensajes):>9.1f}{costo:>16.1f}")
+
+
+# ================================================================
+# RUNNER
+# ================================================================
+def parsear_argumentos(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks del servidor de Sopa de Letras")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    workers = subparsers.add_parser("workers", help="escalado de conexiones/seg por workers")
+    workers.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    workers.add_argument("--puerto", type=int, default=5100)
+    workers.add_argument("--duracion", type=float, default=5.0)
+    workers.add_argument("--generadores", type=int, default=2, help="procesos generadores de carga")
+    workers.add_argument("--concurrencia", type=int, default=20, help="conexiones por generador")
+    workers.add_argument("--comando", default="ESTADISTICAS")
+    workers.set_defaults(funcion=bench_workers)
+
+    salas = subparsers.add_parser("salas", help="latencia de difusión en salas grandes")
+    salas.add_argument("--jugadores", type=int, nargs="+", default=[100, 1000, 2000])
+    salas.add_argument("--rondas", type=int, default=5, help="palabras encontradas por medición")
+    salas.add_argument("--puerto", type=int, default=5101)
+    salas.set_defaults(funcion=bench_salas)
+
+    dificultad = subparsers.add_parser("dificultad", help="generación de tableros por nivel")
+    dificultad.add_argument("--tableros", type=int, default=200)
+    dificultad.set_defaults(funcion=bench_dificultad)
+
+    arranque = subparsers.add_parser("arranque", help="tiempo hasta el primer accept")
+    arranque.add_argument("--tableros", type=int, nargs="+", default=[0, 1000, 10000])
+    arranque.add_argument("--puerto", type=int, default=5102)
+    arranque.set_defaults(funcion=bench_arranque)
+
+    lideres = subparsers.add_parser("lideres", help="estadísticas y clasificaciones con muchos juegos")
+    lideres.add_argument("--juegos", type=int, default=1000000)
+    lideres.add_argument("--tableros", type=int, default=1000)
+    lideres.set_defaults(funcion=bench_lideres)
+
+    apagado = subparsers.add_parser("apagado", help="apagado ordenado con conexiones abiertas")
+    apagado.add_argument("--conexiones", type=int, nargs="+", default=[10, 100, 1000])
+    apagado.add_argument("--ocupados", type=int, default=10, help="conexiones con un START en curso")
+    apagado.add_argument("--puerto", type=int, default=5103)
+    apagado.set_defaults(funcion=bench_apagado)
+
+    compresion = subparsers.add_parser("compresion", help="CPU frente a ancho de banda de deflate")
+    compresion.add_argument("--muestras", type=int, default=200)
+    compresion.set_defaults(funcion=bench_compresion)
+
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    argumentos = parsear_argumentos()
+    argumentos.funcion(argumentos)
@@ -1,7 +1,8 @@
 import random
 import threading
-from config import BOARD_SIZE
-from typing import List, Tuple
+from collections import Counter
+from config import BOARD_SIZE, DIFICULTADES
+from typing import Dict, List, Optional, Tuple
 
 
 tablero_lock = threading.Lock()
@@ -10,12 +11,24 @@ def crear_tablero_vacio():
     """Crea un tablero lleno de letras aleatorias"""
     return [[' ' for _ in range(BOARD_SIZE)] for _ in range(BOARD_SIZE)]
 
-def rellenar_espacios_vacios(tablero):
-    """Rellena los espacios vacíos con letras aleatorias"""
+def rellenar_espacios_vacios(tablero, palabras: List[str] = None, proporcion_similar: float = 0.0):
+    """
+    Rellena los espacios vacíos con letras aleatorias.
+    Con `proporcion_similar` > 0, esa fracción de celdas usa la frecuencia de
+    letras de `palabras`, lo que hace que el relleno se confunda con ellas.
+    """
+    letras, pesos = None, None
+    if palabras and proporcion_similar > 0:
+        frecuencias = Counter("".join(palabras))
+        letras, pesos = list(frecuencias), list(frecuencias.values())
+    
     for i in range(len(tablero)):
         for j in range(len(tablero[i])):
             if tablero[i][j] == ' ':
-                tablero[i][j] = random.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+                if letras and random.random() < proporcion_similar:
+                    tablero[i][j] = random.choices(letras, pesos)[0]
+                else:
+                    tablero[i][j] = random.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
 
 def puede_colocar_palabra(tablero: List[List[str]], palabra: str, 
                           fila: int, col: int, dir_fila: int, dir_col: int) -> bool:
@@ -46,6 +59,25 @@ def colocar_palabra_en_tablero(tablero: List[List[str]], palabra: str,
     for i, letra in enumerate(palabra):
         tablero[fila + dir_fila * i][col + dir_col * i] = letra
 
+def localizar_palabra(tablero: List[List[str]], palabra: str) -> Optional[Tuple[int, int, int, int]]:
+    """Retorna la colocación (fila, col, dir_fila, dir_col) de una palabra ya presente en el tablero"""
+    direcciones = [(0, 1), (1, 0), (1, 1), (1, -1), (0, -1), (-1, 0), (-1, -1), (-1, 1)]
+    lado = len(tablero)
+    
+    for fila in range(lado):
+        for col in range(lado):
+            if tablero[fila][col] != palabra[0]:
+                continue
+            for dir_fila, dir_col in direcciones:
+                fila_fin = fila + dir_fila * (len(palabra) - 1)
+                col_fin = col + dir_col * (len(palabra) - 1)
+                if not (0 <= fila_fin < lado and 0 <= col_fin < lado):
+                    continue
+                if all(tablero[fila + dir_fila * i][col + dir_col * i] == letra
+                       for i, letra in enumerate(palabra)):
+                    return fila, col, dir_fila, dir_col
+    return None
+
 def intentar_colocar_palabra(tablero: List[List[str]], palabra: str, max_intentos: int = 200) -> bool:
     """Intenta colocar una palabra en el tablero con múltiples intentos"""
     
@@ -71,8 +103,22 @@ def intentar_colocar_palabra(tablero: List[List[str]], palabra: str, max_intento
     
     return False
 
+def verificar_factibilidad(palabras: List[str], lado: int = BOARD_SIZE):
+    """
+    Descarta de entrada los conjuntos de palabras que no pueden caber en el tablero,
+    en lugar de agotar los reintentos. Lanza ValueError con el motivo.
+    """
+    larga = max(palabras, key=len, default="")
+    if len(larga) > lado:
+        raise ValueError(f"La palabra {larga} ({len(larga)} letras) no cabe en un tablero de {lado}x{lado}")
+    
+    total_letras = sum(len(p) for p in palabras)
+    if total_letras > lado * lado:
+        raise ValueError(f"Las palabras suman {total_letras} letras y el tablero solo tiene {lado * lado} celdas")
+
 def generar_tablero_con_palabras(palabras: List[str]) -> Tuple[List[List[str]], List[str]]:
     """Genera un tablero con las palabras dadas usando hilos - GARANTIZA todas las palabras"""
+    verificar_factibilidad(palabras)
     
     max_intentos_generacion = 10  
     
@@ -140,6 +186,7 @@ def generar_tablero_garantizado(palabras: List[str], intentos_maximos: int = 20)
     Versión alternativa que GARANTIZA colocar todas las palabras
     Reintenta múltiples veces hasta lograrlo
     """
+    verificar_factibilidad(palabras)
     for intento in range(intentos_maximos):
         tablero, palabras_colocadas = generar_tablero_con_palabras(palabras)
         
@@ -161,4 +208,142 @@ def generar_tablero_garantizado(palabras: List[str], intentos_maximos: int = 20)
     rellenar_espacios_vacios(tablero)
     print(f"✓ Método secuencial: {len(palabras_colocadas)}/{len(palabras)} palabras colocadas")
     
-    return tablero, palabras_colocadas
\ No newline at end of file
+    return tablero, palabras_colocadas
+
+
+# ================================================================
+# DIFICULTAD
+# ================================================================
+
+Colocacion = Tuple[str, int, int, int, int]  # (palabra, fila, col, dir_fila, dir_col)
+
+PESO_DIRECCIONES = 0.4
+PESO_SOLAPAMIENTO = 0.3
+PESO_RELLENO = 0.3
+SOLAPAMIENTO_MAXIMO = 0.25  # Fracción de letras compartidas que ya cuenta como dificultad máxima
+
+def dificultad_direccion(dir_fila: int, dir_col: int) -> float:
+    """0 para horizontal hacia la derecha; suma 0.5 por diagonal y 0.5 por sentido inverso"""
+    diagonal = dir_fila != 0 and dir_col != 0
+    inversa = dir_col < 0 or (dir_col == 0 and dir_fila < 0)
+    return 0.5 * diagonal + 0.5 * inversa
+
+def _puntuacion(suma_direcciones: float, letras_compartidas: int, total_letras: int,
+                cantidad: int, proporcion_similar: float) -> float:
+    direcciones = suma_direcciones / cantidad if cantidad else 0.0
+    solapamiento = min(1.0, (letras_compartidas / total_letras) / SOLAPAMIENTO_MAXIMO) if total_letras else 0.0
+    return (PESO_DIRECCIONES * direcciones + PESO_SOLAPAMIENTO * solapamiento
+            + PESO_RELLENO * proporcion_similar)
+
+def calcular_dificultad(colocaciones: List[Colocacion], proporcion_similar: float = 0.0) -> Dict[str, float]:
+    """Puntúa un tablero a partir de cómo se colocaron sus palabras"""
+    ocupadas = Counter()
+    suma_direcciones = 0.0
+    total_letras = 0
+    
+    for palabra, fila, col, dir_fila, dir_col in colocaciones:
+        suma_direcciones += dificultad_direccion(dir_fila, dir_col)
+        total_letras += len(palabra)
+        for i in range(len(palabra)):
+            ocupadas[(fila + dir_fila * i, col + dir_col * i)] += 1
+    
+    letras_compartidas = sum(n - 1 for n in ocupadas.values())
+    cantidad = len(colocaciones)
+    return {
+        "puntuacion": round(_puntuacion(suma_direcciones, letras_compartidas, total_letras,
+                                        cantidad, proporcion_similar), 3),
+        "direcciones": round(suma_direcciones / cantidad, 3) if cantidad else 0.0,
+        "solapamiento": round(letras_compartidas / total_letras, 3) if total_letras else 0.0,
+        "relleno_similar": proporcion_similar
+    }
+
+def _contar_solapamiento(tablero: List[List[str]], palabra: str,
+                         fila: int, col: int, dir_fila: int, dir_col: int) -> int:
+    """Letras ya presentes que la palabra reutilizaría, o -1 si no cabe"""
+    fila_fin = fila + dir_fila * (len(palabra) - 1)
+    col_fin = col + dir_col * (len(palabra) - 1)
+    if not (0 <= fila_fin < BOARD_SIZE and 0 <= col_fin < BOARD_SIZE):
+        return -1
+    
+    compartidas = 0
+    for i, letra in enumerate(palabra):
+        actual = tablero[fila + dir_fila * i][col + dir_col * i]
+        if actual == letra:
+            compartidas += 1
+        elif actual != ' ':
+            return -1
+    return compartidas
+
+def generar_tablero_por_dificultad(palabras: List[str], dificultad: str = "MEDIO",
+                                   candidatos: int = 12, max_sondeos: int = 400,
+                                   max_intentos: int = 10,
+                                   tolerancia: float = 0.1) -> Tuple[List[List[str]], List[str], Dict[str, float]]:
+    """
+    Genera un tablero cuya puntuación de dificultad se acerque al objetivo del nivel.
+    Por cada palabra se sondean varias posiciones válidas y se elige la que deja la
+    puntuación parcial más cerca del objetivo, en lugar de regenerar tableros completos.
+    Si ningún intento queda a menos de `tolerancia` se retorna el más cercano.
+    """
+    verificar_factibilidad(palabras)
+    objetivo = DIFICULTADES[dificultad]
+    direcciones = [(0, 1), (1, 0), (1, 1), (1, -1), (0, -1), (-1, 0), (-1, -1), (-1, 1)]
+    # El relleno aporta su parte fija; direcciones y solapamiento cubren el resto
+    proporcion_similar = objetivo
+    ordenadas = sorted(palabras, key=len, reverse=True)
+    mejor = None
+    
+    for _ in range(max_intentos):
+        tablero = crear_tablero_vacio()
+        colocaciones: List[Colocacion] = []
+        suma_direcciones = 0.0
+        letras_compartidas = 0
+        total_letras = 0
+        
+        for palabra in ordenadas:
+            opciones = []
+            for _ in range(max_sondeos):
+                fila = random.randrange(BOARD_SIZE)
+                col = random.randrange(BOARD_SIZE)
+                dir_fila, dir_col = random.choice(direcciones)
+                compartidas = _contar_solapamiento(tablero, palabra, fila, col, dir_fila, dir_col)
+                if compartidas < 0:
+                    continue
+                
+                parcial = _puntuacion(suma_direcciones + dificultad_direccion(dir_fila, dir_col),
+                                      letras_compartidas + compartidas, total_letras + len(palabra),
+                                      len(colocaciones) + 1, proporcion_similar)
+                opciones.append((abs(parcial - objetivo), compartidas, (fila, col, dir_fila, dir_col)))
+                if len(opciones) >= candidatos:
+                    break
+            
+            if not opciones:
+                break
+            
+            _, compartidas, (fila, col, dir_fila, dir_col) = min(opciones, key=lambda o: o[0])
+            colocar_palabra_en_tablero(tablero, palabra, fila, col, dir_fila, dir_col)
+            colocaciones.append((palabra, fila, col, dir_fila, dir_col))
+            suma_direcciones += dificultad_direccion(dir_fila, dir_col)
+            letras_compartidas += compartidas
+            total_letras += len(palabra)
+        
+        if len(colocaciones) == len(palabras):
+            puntuacion = calcular_dificultad(colocaciones, proporcion_similar)
+            error = abs(puntuacion["puntuacion"] - objetivo)
+            if mejor is None or error < mejor[0]:
+                mejor = (error, tablero, [c[0] for c in colocaciones], puntuacion)
+            if error <= tolerancia:
+                break
+    
+    if mejor is not None:
+        error, tablero, palabras_colocadas, puntuacion = mejor
+        rellenar_espacios_vacios(tablero, palabras, proporcion_similar)
+        puntuacion["objetivo_alcanzado"] = error <= tolerancia
+        return tablero, palabras_colocadas, puntuacion
+    
+    # Sin éxito: se recurre al generador general y se puntúa el tablero que produjo
+    # (su relleno es aleatorio, sin letras similares)
+    tablero, palabras_colocadas = generar_tablero_garantizado(palabras)
+    colocaciones = [(palabra, *localizar_palabra(tablero, palabra)) for palabra in palabras_colocadas]
+    puntuacion = calcular_dificultad(colocaciones)
+    puntuacion["objetivo_alcanzado"] = False
+    return tablero, palabras_colocadas, puntuacion
@@ -0,0 +1,40 @@
+import bisect
+from typing import List, Optional, Tuple
+
+
+class TablaLideres:
+    """
+    Top-N de tiempos de finalización, ordenado de menor a mayor con bisect.
+    Una marca que no entra en el top se descarta en O(1); si entra, la
+    inserción cuesta O(log n) de búsqueda más el desplazamiento de la lista (n <= limite).
+    """
+    def __init__(self, limite: int):
+        self.limite = limite
+        self._marcas: List[Tuple[float, int, int]] = []  # (tiempo, juego_id, tablero_id)
+
+    def __len__(self):
+        return len(self._marcas)
+
+    def registrar(self, tiempo: float, juego_id: int, tablero_id: int) -> Optional[int]:
+        """Inserta la marca si entra en el top; retorna su posición (1 = la mejor) o None"""
+        marca = (tiempo, juego_id, tablero_id)
+        if len(self._marcas) >= self.limite and marca >= self._marcas[-1]:
+            return None
+
+        posicion = bisect.bisect(self._marcas, marca)
+        self._marcas.insert(posicion, marca)
+        if len(self._marcas) > self.limite:
+            self._marcas.pop()
+        return posicion + 1
+
+    def top(self, cantidad: Optional[int] = None) -> List[dict]:
+        """Retorna las `cantidad` mejores marcas (todas si es None)"""
+        return [
+            {
+                "posicion": posicion,
+                "juego_id": juego_id,
+                "tablero_id": tablero_id,
+                "tiempo": tiempo
+            }
+            for posicion, (tiempo, juego_id, tablero_id) in enumerate(self._marcas[:cantidad], start=1)
+        ]
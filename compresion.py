@@ -0,0 +1,104 @@
+from contextvars import ContextVar
+from typing import Dict
+
+from websockets.extensions.permessage_deflate import PerMessageDeflate, ServerPerMessageDeflateFactory
+from websockets.frames import CTRL_OPCODES, Opcode
+
+# Comando cuya respuesta se está enviando; lo fija el handler y se hereda en cada envío
+comando_actual: ContextVar[str] = ContextVar("comando_actual", default="OTRO")
+
+
+class MetricasCompresion:
+    """Bytes antes y después de per-message-deflate, por comando"""
+    def __init__(self):
+        self.por_comando: Dict[str, Dict[str, int]] = {}
+
+    def registrar(self, comando: str, originales: int, enviados: int, comprimido: bool):
+        """Registra un mensaje saliente (los no comprimidos cuentan con enviados == originales)"""
+        datos = self.por_comando.get(comando)
+        if datos is None:
+            datos = self.por_comando[comando] = {
+                "mensajes": 0, "comprimidos": 0, "bytes_originales": 0, "bytes_enviados": 0
+            }
+        datos["mensajes"] += 1
+        datos["comprimidos"] += comprimido
+        datos["bytes_originales"] += originales
+        datos["bytes_enviados"] += enviados
+
+    def resumen(self) -> Dict[str, dict]:
+        """Retorna los contadores por comando con la proporción enviada/original"""
+        return {
+            comando: {
+                **datos,
+                "proporcion": round(datos["bytes_enviados"] / datos["bytes_originales"], 3)
+                if datos["bytes_originales"] else None
+            }
+            for comando, datos in self.por_comando.items()
+        }
+
+
+class DeflateConUmbral(PerMessageDeflate):
+    """
+    PerMessageDeflate que envía sin comprimir los mensajes por debajo de `umbral`
+    bytes (RFC 7692 lo permite por mensaje: basta con no marcar RSV1) y mide
+    cuánto ocupa cada mensaje antes y después.
+    """
+    def __init__(self, *args, umbral: int = 0, metricas: MetricasCompresion = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.umbral = umbral
+        self.metricas = metricas
+        self._comprimir_mensaje = True
+
+    def encode(self, frame):
+        if frame.opcode in CTRL_OPCODES:
+            return frame
+
+        if frame.opcode is not Opcode.CONT:
+            # La decisión se toma con el primer fragmento y vale para todo el mensaje
+            self._comprimir_mensaje = len(frame.data) >= self.umbral
+
+        codificado = super().encode(frame) if self._comprimir_mensaje else frame
+        if self.metricas is not None:
+            self.metricas.registrar(comando_actual.get(), len(frame.data), len(codificado.data),
+                                    self._comprimir_mensaje)
+        return codificado
+
+
+class FabricaDeflate(ServerPerMessageDeflateFactory):
+    """Negocia per-message-deflate con ventana/memoria propias y usa DeflateConUmbral"""
+    def __init__(self, umbral: int = 0, metricas: MetricasCompresion = None, **kwargs):
+        super().__init__(**kwargs)
+        self.umbral = umbral
+        self.metricas = metricas
+
+    def process_request_params(self, params, accepted_extensions):
+        respuesta, extension = super().process_request_params(params, accepted_extensions)
+        return respuesta, DeflateConUmbral(
+            extension.remote_no_context_takeover,
+            extension.local_no_context_takeover,
+            extension.remote_max_window_bits,
+            extension.local_max_window_bits,
+            extension.compress_settings,
+            umbral=self.umbral,
+            metricas=self.metricas
+        )
+
+
+def crear_extensiones(configuracion: dict, metricas: MetricasCompresion = None):
+    """
+    Construye las extensiones para websockets.serve a partir de la configuración
+    (ver COMPRESION en config.py); retorna None si la compresión está desactivada.
+    """
+    if not configuracion.get("activa", True):
+        return None
+    return [FabricaDeflate(
+        umbral=configuracion.get("umbral", 0),
+        metricas=metricas,
+        server_max_window_bits=configuracion.get("ventana_servidor"),
+        client_max_window_bits=configuracion.get("ventana_cliente"),
+        server_no_context_takeover=not configuracion.get("contexto_compartido", True),
+        compress_settings={
+            "memLevel": configuracion.get("nivel_memoria", 5),
+            "level": configuracion.get("nivel", 6)
+        }
+    )]
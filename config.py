@@ -7,3 +7,50 @@ WORDS = [
     "CIRUJANO", "FOTOGRAFO", "MODISTA",
     "GEOLOGO", "JUEZ", "MODELO"
 ]
+
+# Límites por conexión: (capacidad del cubo, tokens repuestos por segundo)
+RATE_LIMIT_SESION = (30, 10.0)
+RATE_LIMITS_COMANDO = {
+    "START": (3, 0.2),
+    "UNIRSE": (3, 0.2),
+    "RESOLVER": (5, 1.0),
+}
+
+MAX_MESSAGE_SIZE = 16 * 1024    # bytes por mensaje entrante
+MAX_PENDING_MESSAGES = 16       # mensajes entrantes en cola por conexión
+IDLE_TIMEOUT = 300              # segundos sin mensajes antes de cerrar
+MAX_COMANDOS_LOTE = 32          # comandos por mensaje en modo lote
+
+# Puntuación objetivo (0 a 1) para cada nivel de dificultad del tablero
+DIFICULTADES = {
+    "FACIL": 0.2,
+    "MEDIO": 0.45,
+    "DIFICIL": 0.65,
+}
+
+# per-message-deflate (ver benchmarks.py compresion): nivel 1 cuesta la mitad de CPU que el 6
+# por ~15% más de bytes; ventanas > 12 bits no ayudan con mensajes de < 4 KB
+COMPRESION = {
+    "activa": True,
+    "umbral": 256,              # bytes; los mensajes más cortos se envían sin comprimir
+    "ventana_servidor": 12,     # bits: 16 KB de ventana por conexión
+    "ventana_cliente": 10,      # los comandos entrantes son cortos
+    "nivel_memoria": 5,
+    "nivel": 1,
+    "contexto_compartido": True
+}
+
+CHECKPOINT_ARCHIVO = "checkpoint_juegos.jsonl"  # Cambios incrementales (tableros y juegos)
+INTERVALO_CHECKPOINT = 60  # segundos entre checkpoints en segundo plano
+PLAZO_APAGADO = 10.0       # segundos máximos para drenar comandos al apagar
+PLAZO_GUARDADO = 5.0       # segundos máximos para el checkpoint y el snapshot finales
+COMPACTAR_CHECKPOINT = 2.0  # al arrancar se compacta si tiene más del doble de líneas que registros vivos
+
+SNAPSHOT_ARCHIVO = "snapshot_storage.pkl"  # Snapshot binario para arranque rápido
+SNAPSHOT_TABLEROS_RECIENTES = 500
+
+MAX_PALABRAS_TABLERO = 30  # Tope de palabras por tablero (START con cantidad)
+
+TOP_LIDERES = 10  # Marcas que guarda cada tabla de líderes (por tablero, categoría y global)
+
+TABLEROS_EN_MEMORIA = 2000  # Con --archivo-tableros, los más antiguos pasan al archivo mmap
@@ -1,6 +1,52 @@
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 import json
+import os
+import pickle
+import random
+import threading
+
+from clasificacion import TablaLideres
+from config import COMPACTAR_CHECKPOINT, TOP_LIDERES
+
+FRANJAS_LOCKS_JUEGOS = 64
+VERSION_SNAPSHOT = 2
+
+PALABRAS_DEFAULT = [
+    "TRADUCTOR", "CAMARERA", "EMPLEADO",
+    "RELOJERO", "APICULTOR", "ATLETA",
+    "ASTRONAUTA", "CONDUCTOR", "JOYERO",
+    "CIRUJANO", "FOTOGRAFO", "MODISTA",
+    "GEOLOGO", "JUEZ", "MODELO"
+]
+
+CATEGORIAS_DEFAULT = {
+    "PROFESIONES": PALABRAS_DEFAULT,
+    "ANIMALES": [
+        "ELEFANTE", "JIRAFA", "COCODRILO", "MARIPOSA", "TORTUGA",
+        "CANGURO", "PINGUINO", "HIPOPOTAMO", "LEOPARDO", "MURCIELAGO",
+        "ARDILLA", "CAMELLO", "DELFIN", "GORILA", "BALLENA",
+        "HORMIGA", "LECHUZA", "TIBURON", "CONEJO", "ZORRO"
+    ],
+    "PAISES": [
+        "ARGENTINA", "COLOMBIA", "VENEZUELA", "PORTUGAL", "AUSTRALIA",
+        "MARRUECOS", "FINLANDIA", "NICARAGUA", "URUGUAY", "PARAGUAY",
+        "ALEMANIA", "JAPON", "CANADA", "EGIPTO", "NORUEGA",
+        "TAILANDIA", "ECUADOR", "GRECIA", "KENIA", "PERU"
+    ],
+    "FRUTAS": [
+        "MANZANA", "MARACUYA", "FRAMBUESA", "GUANABANA", "MANDARINA",
+        "ALBARICOQUE", "ARANDANO", "CIRUELA", "GRANADA", "MELOCOTON",
+        "SANDIA", "PAPAYA", "LIMON", "CEREZA", "GUAYABA",
+        "MELON", "PERA", "KIWI", "MANGO", "COCO"
+    ],
+    "DEPORTES": [
+        "BALONCESTO", "ATLETISMO", "NATACION", "CICLISMO", "GIMNASIA",
+        "BALONMANO", "ESGRIMA", "VOLEIBOL", "ALPINISMO", "PATINAJE",
+        "BEISBOL", "TENIS", "FUTBOL", "RUGBY", "BOXEO",
+        "REMO", "GOLF", "JUDO", "SURF", "KARATE"
+    ]
+}
 
 class Palabra:
     """Representa una palabra del juego"""
@@ -16,10 +62,13 @@ class Palabra:
 
 class Tablero:
     """Representa un tablero generado"""
-    def __init__(self, tablero_id: int, matriz: List[List[str]], palabras: List[str]):
+    def __init__(self, tablero_id: int, matriz: List[List[str]], palabras: List[str],
+                 colocaciones: Optional[Dict[str, tuple]] = None, categoria: str = "PROFESIONES"):
         self.id = tablero_id
         self.matriz = matriz
         self.palabras = palabras
+        self.colocaciones = colocaciones  # palabra -> (fila, col, dir_fila, dir_col), si se conoce
+        self.categoria = categoria
         self.fecha_creacion = datetime.now()
     
     def to_dict(self):
@@ -27,6 +76,7 @@ class Tablero:
             "id": self.id,
             "matriz": self.matriz,
             "palabras": self.palabras,
+            "categoria": self.categoria,
             "fecha_creacion": self.fecha_creacion.isoformat()
         }
 
@@ -69,10 +119,15 @@ class Juego:
 
 class DataStorage:
     """Simula una base de datos usando ArrayLists (listas de Python)"""
+
+    es_bloqueante = False  # En memoria: AsyncStorage lo llama directo desde el event loop
     
     def __init__(self):
        
         self.palabras: List[Palabra] = []
+        # Índices de palabras: por texto (unicidad) y por categoría (muestreo)
+        self._palabras_por_texto: Dict[str, Palabra] = {}
+        self._palabras_por_categoria: Dict[str, List[str]] = {}
         self.tableros: List[Tablero] = []
         self.juegos: List[Juego] = []
         
@@ -80,62 +135,163 @@ class DataStorage:
         self._next_tablero_id = 1
         self._next_juego_id = 1
         
+        # Índices por ID: lecturas O(1) sin lock (los objetos se publican ya completos)
+        self._tableros_por_id: Dict[int, Tablero] = {}
+        self._juegos_por_id: Dict[int, Juego] = {}
+        
+        # _lock_altas serializa asignación de IDs + append; los juegos usan locks por franja
+        self._lock_altas = threading.Lock()
+        self._lock_palabras = threading.Lock()
+        self._locks_juegos = [threading.Lock() for _ in range(FRANJAS_LOCKS_JUEGOS)]
+        
+        # Tableros históricos fuera de memoria (ver configurar_archivo)
+        self._archivo = None
+        self._tableros_en_memoria = 0
+        self._hilo_archivado: Optional[threading.Thread] = None
+        
+        # IDs modificados desde el último checkpoint (ver guardar_checkpoint)
+        self._lock_sucios = threading.Lock()
+        self._tableros_sucios = set()
+        self._juegos_sucios = set()
+        
+        # Contadores y clasificaciones que se mantienen al crear/finalizar juegos
+        self._lock_lideres = threading.Lock()
+        self._inicializar_clasificaciones()
         
         self._inicializar_palabras()
     
+    def _lock_juego(self, juego_id: int) -> threading.Lock:
+        """Lock de la franja que protege al juego dado"""
+        return self._locks_juegos[hash(juego_id) % FRANJAS_LOCKS_JUEGOS]
+    
+    def _inicializar_clasificaciones(self):
+        self._juegos_completados = 0
+        self._lideres_global = TablaLideres(TOP_LIDERES)
+        self._lideres_por_tablero: Dict[int, TablaLideres] = {}
+        self._lideres_por_categoria: Dict[str, TablaLideres] = {}
+    
     def _inicializar_palabras(self):
         """Inicializa el ArrayList de palabras"""
-        palabras_default = [
-            "TRADUCTOR", "CAMARERA", "EMPLEADO",
-            "RELOJERO", "APICULTOR", "ATLETA",
-            "ASTRONAUTA", "CONDUCTOR", "JOYERO",
-            "CIRUJANO", "FOTOGRAFO", "MODISTA",
-            "GEOLOGO", "JUEZ", "MODELO"
-        ]
-        
-        for palabra_texto in palabras_default:
-            palabra = Palabra(palabra_texto, "PROFESIONES")
-            self.palabras.append(palabra)
-    
+        for categoria, textos in CATEGORIAS_DEFAULT.items():
+            for palabra_texto in textos:
+                self._indexar_palabra(Palabra(palabra_texto, categoria))
     
+    def _indexar_palabra(self, palabra: Palabra):
+        """Agrega la palabra a la lista y a sus índices (requiere _lock_palabras o exclusividad)"""
+        self.palabras.append(palabra)
+        self._palabras_por_texto[palabra.texto] = palabra
+        self._palabras_por_categoria.setdefault(palabra.categoria, []).append(palabra.texto)
     
     def agregar_palabra(self, texto: str, categoria: str = "PROFESIONES"):
         """Agrega una palabra al ArrayList"""
-       
-        if not any(p.texto == texto.upper() for p in self.palabras):
-            palabra = Palabra(texto, categoria)
-            self.palabras.append(palabra)
-            return True
+        with self._lock_palabras:
+            if texto.upper() not in self._palabras_por_texto:
+                self._indexar_palabra(Palabra(texto, categoria))
+                return True
         return False
     
     def obtener_palabras(self, categoria: str = None) -> List[str]:
         """Obtiene palabras del ArrayList, opcionalmente filtradas por categoría"""
         if categoria:
-            return [p.texto for p in self.palabras if p.categoria == categoria]
+            return list(self._palabras_por_categoria.get(categoria, ()))
         return [p.texto for p in self.palabras]
     
+    def muestrear_palabras(self, categoria: str, cantidad: int) -> List[str]:
+        """Elige `cantidad` palabras distintas al azar de una categoría (todas si hay menos)"""
+        textos = self._palabras_por_categoria.get(categoria, ())
+        return random.sample(textos, min(cantidad, len(textos)))
+    
+    def obtener_categorias(self) -> Dict[str, int]:
+        """Retorna cada categoría con su cantidad de palabras"""
+        return {categoria: len(textos) for categoria, textos in self._palabras_por_categoria.items()}
+    
     def buscar_palabra(self, texto: str) -> Optional[Palabra]:
         """Busca una palabra en el ArrayList"""
-        for palabra in self.palabras:
-            if palabra.texto == texto.upper():
-                return palabra
-        return None
+        return self._palabras_por_texto.get(texto.upper())
     
    
     
-    def guardar_tablero(self, matriz: List[List[str]], palabras: List[str]) -> int:
+    def configurar_archivo(self, archivo, tableros_en_memoria: int):
+        """
+        Mantiene en memoria solo los `tableros_en_memoria` más recientes; los más
+        antiguos se anexan al archivo (ArchivoTableros) y se leen de él bajo demanda.
+        Los ids nuevos continúan tras el mayor id archivado, aunque no haya snapshot.
+        """
+        with self._lock_altas:
+            self._archivo = archivo
+            self._tableros_en_memoria = tableros_en_memoria
+            self._next_tablero_id = max(self._next_tablero_id, archivo.ultimo_id + 1)
+    
+    def guardar_tablero(self, matriz: List[List[str]], palabras: List[str], categoria: str = "PROFESIONES") -> int:
         """Guarda un tablero en el ArrayList y retorna su ID"""
-        tablero = Tablero(self._next_tablero_id, matriz, palabras)
-        self.tableros.append(tablero)
-        self._next_tablero_id += 1
+        iniciar = None
+        with self._lock_altas:
+            tablero = Tablero(self._next_tablero_id, matriz, palabras, categoria=categoria)
+            self._next_tablero_id += 1
+            self.tableros.append(tablero)
+            self._tableros_por_id[tablero.id] = tablero
+            self._marcar_sucio(self._tableros_sucios, tablero.id)
+            if (self._archivo is not None and self._hilo_archivado is None
+                    and len(self.tableros) > self._tableros_en_memoria):
+                self._hilo_archivado = threading.Thread(
+                    target=self._archivar_antiguos, args=(self._archivo,), daemon=True)
+                iniciar = self._hilo_archivado
+        if iniciar is not None:
+            # La escritura va en un hilo aparte: ni bloquea el event loop ni retiene _lock_altas
+            iniciar.start()
         return tablero.id
     
+    def _archivar_antiguos(self, archivo):
+        """Mueve al archivo los tableros más antiguos, en bloques (corre en _hilo_archivado)"""
+        fallidos = set()  # No caben en el formato del archivo: se quedan en memoria
+        try:
+            while True:
+                with self._lock_altas:
+                    exceso = len(self.tableros) - len(fallidos) - self._tableros_en_memoria
+                    if self._archivo is not archivo or exceso <= 0:
+                        self._hilo_archivado = None
+                        return
+                    antiguos = [t for t in self.tableros[:exceso + len(fallidos) + self._tableros_en_memoria // 4]
+                                if t.id not in fallidos]
+                # Primero se escriben y luego se quitan: un lector nunca encuentra el hueco
+                archivados = set()
+                for tablero in antiguos:
+                    # Un id ya archivado (lote anterior interrumpido) cuenta como hecho
+                    if tablero.id not in archivo:
+                        try:
+                            archivo.agregar(tablero)
+                        except ValueError as e:
+                            print(f"⚠️ Tablero {tablero.id} no archivado: {e}")
+                            fallidos.add(tablero.id)
+                            continue
+                    archivados.add(tablero.id)
+                with self._lock_altas:
+                    if self._archivo is not archivo:
+                        self._hilo_archivado = None
+                        return
+                    self.tableros[:] = [t for t in self.tableros if t.id not in archivados]
+                    for tablero_id in archivados:
+                        self._tableros_por_id.pop(tablero_id, None)
+        except BaseException:
+            with self._lock_altas:
+                self._hilo_archivado = None
+            raise
+    
+    def _esta_archivado(self, tablero_id: int) -> bool:
+        return self._archivo is not None and tablero_id in self._archivo
+    
+    def esperar_archivado(self):
+        """Espera a que termine el archivado en curso, si lo hay"""
+        hilo = self._hilo_archivado
+        if hilo is not None:
+            hilo.join()
+    
     def obtener_tablero(self, tablero_id: int) -> Optional[Tablero]:
-        """Busca un tablero por ID en el ArrayList"""
-        for tablero in self.tableros:
-            if tablero.id == tablero_id:
-                return tablero
-        return None
+        """Busca un tablero por ID (sin lock: los tableros no se modifican)"""
+        tablero = self._tableros_por_id.get(tablero_id)
+        if tablero is None and self._archivo is not None:
+            return self._archivo.obtener(tablero_id)
+        return tablero
     
     def listar_tableros(self) -> List[Tablero]:
         """Retorna todos los tableros del ArrayList"""
@@ -145,29 +301,75 @@ class DataStorage:
     
     def crear_juego(self, tablero_id: int) -> int:
         """Crea un nuevo juego en el ArrayList y retorna su ID"""
-        juego = Juego(self._next_juego_id, tablero_id)
-        self.juegos.append(juego)
-        self._next_juego_id += 1
+        with self._lock_altas:
+            juego = Juego(self._next_juego_id, tablero_id)
+            self._next_juego_id += 1
+            self.juegos.append(juego)
+            self._juegos_por_id[juego.id] = juego
+            self._marcar_sucio(self._juegos_sucios, juego.id)
         return juego.id
     
     def obtener_juego(self, juego_id: int) -> Optional[Juego]:
-        """Busca un juego por ID en el ArrayList"""
-        for juego in self.juegos:
-            if juego.id == juego_id:
-                return juego
-        return None
+        """Busca un juego por ID"""
+        return self._juegos_por_id.get(juego_id)
     
-    def actualizar_juego(self, juego_id: int, palabra_encontrada: str = None, finalizar: bool = False):
+    def actualizar_juego(self, juego_id: int, palabra_encontrada: str = None, finalizar: bool = False,
+                         palabras_encontradas: List[str] = None):
         """Actualiza el estado de un juego"""
         juego = self.obtener_juego(juego_id)
         if juego:
-            if palabra_encontrada:
-                juego.agregar_palabra_encontrada(palabra_encontrada)
-            if finalizar:
-                juego.finalizar()
+            with self._lock_juego(juego_id):
+                if palabra_encontrada:
+                    juego.agregar_palabra_encontrada(palabra_encontrada)
+                for palabra in filter(None, palabras_encontradas or ()):
+                    juego.agregar_palabra_encontrada(palabra)
+                recien_finalizado = finalizar and not juego.completado
+                if recien_finalizado:
+                    juego.finalizar()
+            self._marcar_sucio(self._juegos_sucios, juego_id)
+            if recien_finalizado:
+                self._registrar_finalizacion(juego)
             return True
         return False
     
+    def _marcar_sucio(self, sucios: set, elemento_id: int):
+        with self._lock_sucios:
+            sucios.add(elemento_id)
+    
+    def _registrar_finalizacion(self, juego: Juego):
+        """Actualiza contadores y clasificaciones; solo clasifican los juegos con todas las palabras encontradas"""
+        tablero = self.obtener_tablero(juego.tablero_id)
+        completo = tablero is not None and set(tablero.palabras) <= set(juego.palabras_encontradas)
+        tiempo = juego.get_tiempo_transcurrido()
+        
+        with self._lock_lideres:
+            self._juegos_completados += 1
+            if not completo:
+                return
+            self._lideres_global.registrar(tiempo, juego.id, juego.tablero_id)
+            por_tablero = self._lideres_por_tablero.get(juego.tablero_id)
+            if por_tablero is None:
+                por_tablero = self._lideres_por_tablero[juego.tablero_id] = TablaLideres(TOP_LIDERES)
+            por_tablero.registrar(tiempo, juego.id, juego.tablero_id)
+            por_categoria = self._lideres_por_categoria.get(tablero.categoria)
+            if por_categoria is None:
+                por_categoria = self._lideres_por_categoria[tablero.categoria] = TablaLideres(TOP_LIDERES)
+            por_categoria.registrar(tiempo, juego.id, juego.tablero_id)
+    
+    def obtener_lideres(self, tablero_id: int = None, categoria: str = None,
+                        cantidad: int = TOP_LIDERES) -> List[dict]:
+        """Mejores tiempos de un tablero, de una categoría o globales (en ese orden de prioridad)"""
+        if tablero_id is not None:
+            tabla = self._lideres_por_tablero.get(tablero_id)
+        elif categoria is not None:
+            tabla = self._lideres_por_categoria.get(categoria)
+        else:
+            tabla = self._lideres_global
+        if tabla is None:
+            return []
+        with self._lock_lideres:
+            return tabla.top(cantidad)
+    
     def listar_juegos(self) -> List[Juego]:
         """Retorna todos los juegos del ArrayList"""
         return self.juegos
@@ -178,9 +380,9 @@ class DataStorage:
         """Retorna estadísticas del storage"""
         return {
             "total_palabras": len(self.palabras),
-            "total_tableros": len(self.tableros),
+            "total_tableros": len(self.tableros) + (len(self._archivo) if self._archivo is not None else 0),
             "total_juegos": len(self.juegos),
-            "juegos_completados": sum(1 for j in self.juegos if j.completado)
+            "juegos_completados": self._juegos_completados
         }
     
     def exportar_datos(self, archivo: str = "datos_juego.json"):
@@ -196,14 +398,188 @@ class DataStorage:
         
         print(f"✓ Datos exportados a {archivo}")
     
+    def guardar_checkpoint(self, archivo: str) -> int:
+        """
+        Anexa a un archivo JSONL solo los tableros y juegos modificados desde el
+        checkpoint anterior; retorna cuántos registros escribió.
+        """
+        with self._lock_sucios:
+            tableros_ids, self._tableros_sucios = self._tableros_sucios, set()
+            juegos_ids, self._juegos_sucios = self._juegos_sucios, set()
+        
+        lineas = []
+        for tablero_id in sorted(tableros_ids):
+            tablero = self.obtener_tablero(tablero_id)
+            if tablero:
+                lineas.append(json.dumps({"tipo": "tablero", **tablero.to_dict()}, ensure_ascii=False))
+        for juego_id in sorted(juegos_ids):
+            juego = self.obtener_juego(juego_id)
+            if juego:
+                with self._lock_juego(juego_id):
+                    registro = juego.to_dict()
+                lineas.append(json.dumps({"tipo": "juego", **registro}, ensure_ascii=False))
+        
+        if lineas:
+            with open(archivo, 'a', encoding='utf-8') as f:
+                f.write("\n".join(lineas) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+        return len(lineas)
+    
+    @staticmethod
+    def _leer_checkpoint(archivo: str) -> Tuple[Dict[tuple, dict], int]:
+        """
+        Lee el JSONL y deja solo el último registro de cada (tipo, id); ignora
+        líneas truncadas. Retorna los registros y cuántas líneas tenía el archivo.
+        """
+        registros = {}
+        lineas = 0
+        try:
+            with open(archivo, encoding='utf-8') as f:
+                for linea in f:
+                    lineas += 1
+                    try:
+                        registro = json.loads(linea)
+                    except json.JSONDecodeError:
+                        continue  # Última línea a medio escribir
+                    registros[(registro["tipo"], registro["id"])] = registro
+        except FileNotFoundError:
+            pass
+        return registros, lineas
+    
+    @staticmethod
+    def _escribir_checkpoint(archivo: str, registros: Dict[tuple, dict]):
+        """Reemplaza el checkpoint (de forma atómica) por un registro por tablero y juego"""
+        temporal = f"{archivo}.tmp"
+        with open(temporal, 'w', encoding='utf-8') as f:
+            for registro in registros.values():
+                f.write(json.dumps(registro, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporal, archivo)
+    
+    def cargar_checkpoint(self, archivo: str, compactar_desde: float = COMPACTAR_CHECKPOINT) -> int:
+        """
+        Restaura los tableros y juegos de un checkpoint JSONL (gana el último
+        registro de cada id); retorna cuántos registros aplicó. Si el archivo
+        tiene más de `compactar_desde` líneas por registro vivo se compacta
+        aprovechando esta misma lectura, así el apagado nunca lo reescribe.
+        """
+        registros, lineas = self._leer_checkpoint(archivo)
+        if registros and lineas > compactar_desde * len(registros):
+            self._escribir_checkpoint(archivo, registros)
+        finalizados = []
+        aplicados = 0
+        with self._lock_altas:
+            for registro in registros.values():
+                if registro["tipo"] != "tablero":
+                    continue
+                tablero_id = registro["id"]
+                if tablero_id in self._tableros_por_id or self._esta_archivado(tablero_id):
+                    continue
+                tablero = Tablero(tablero_id, registro["matriz"], registro["palabras"],
+                                  categoria=registro.get("categoria", "PROFESIONES"))
+                tablero.fecha_creacion = datetime.fromisoformat(registro["fecha_creacion"])
+                self.tableros.append(tablero)
+                self._tableros_por_id[tablero_id] = tablero
+                self._next_tablero_id = max(self._next_tablero_id, tablero_id + 1)
+                aplicados += 1
+            
+            for registro in registros.values():
+                if registro["tipo"] != "juego" or registro["id"] in self._juegos_por_id:
+                    continue
+                juego = Juego(registro["id"], registro["tablero_id"])
+                juego.tiempo_inicio = datetime.fromisoformat(registro["tiempo_inicio"])
+                if registro["tiempo_fin"]:
+                    juego.tiempo_fin = datetime.fromisoformat(registro["tiempo_fin"])
+                juego.palabras_encontradas = registro["palabras_encontradas"]
+                juego.completado = registro["completado"]
+                self.juegos.append(juego)
+                self._juegos_por_id[juego.id] = juego
+                self._next_juego_id = max(self._next_juego_id, juego.id + 1)
+                if juego.completado:
+                    finalizados.append(juego)
+                aplicados += 1
+            
+            self.tableros.sort(key=lambda t: t.id)
+            self.juegos.sort(key=lambda j: j.id)
+        
+        for juego in finalizados:
+            self._registrar_finalizacion(juego)
+        return aplicados
+    
+    def guardar_snapshot(self, archivo: str, tableros_recientes: int = 500):
+        """
+        Guarda en binario (pickle) las palabras, los tableros más recientes y los
+        contadores de IDs, para restaurarlos rápido al arrancar.
+        """
+        with self._lock_altas:
+            recientes = self.tableros[-tableros_recientes:] if tableros_recientes > 0 else []
+            datos = {
+                "version": VERSION_SNAPSHOT,
+                "palabras": [(p.texto, p.categoria) for p in self.palabras],
+                # Cada fila se guarda como str: menos objetos que serializar y cargar
+                "tableros": [
+                    (t.id, ["".join(fila) for fila in t.matriz], t.palabras, t.categoria, t.fecha_creacion)
+                    for t in recientes
+                ],
+                "next_tablero_id": self._next_tablero_id,
+                "next_juego_id": self._next_juego_id
+            }
+        
+        temporal = f"{archivo}.tmp"
+        with open(temporal, 'wb') as f:
+            pickle.dump(datos, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporal, archivo)
+    
+    def cargar_snapshot(self, archivo: str) -> bool:
+        """Restaura un snapshot creado por guardar_snapshot (solo archivos propios: usa pickle)"""
+        try:
+            with open(archivo, 'rb') as f:
+                datos = pickle.load(f)
+        except FileNotFoundError:
+            return False
+        
+        if datos.get("version") != VERSION_SNAPSHOT:
+            return False
+        
+        with self._lock_altas, self._lock_palabras:
+            # Se suman a las palabras por defecto: un snapshot antiguo no borra categorías nuevas
+            for texto, categoria in datos["palabras"]:
+                if texto.upper() not in self._palabras_por_texto:
+                    self._indexar_palabra(Palabra(texto, categoria))
+            for tablero_id, filas, palabras, categoria, fecha_creacion in datos["tableros"]:
+                # Un snapshot antiguo puede traer tableros que ya se movieron al archivo
+                if tablero_id in self._tableros_por_id or self._esta_archivado(tablero_id):
+                    continue
+                tablero = Tablero(tablero_id, [list(fila) for fila in filas], palabras, categoria=categoria)
+                tablero.fecha_creacion = fecha_creacion
+                self.tableros.append(tablero)
+                self._tableros_por_id[tablero_id] = tablero
+            self.tableros.sort(key=lambda t: t.id)
+            self._next_tablero_id = max(self._next_tablero_id, datos["next_tablero_id"])
+            self._next_juego_id = max(self._next_juego_id, datos["next_juego_id"])
+        return True
+    
     def limpiar_datos(self):
         """Limpia todos los ArrayLists (útil para testing)"""
-        self.palabras.clear()
-        self.tableros.clear()
-        self.juegos.clear()
-        self._next_tablero_id = 1
-        self._next_juego_id = 1
-        self._inicializar_palabras()
+        with self._lock_altas, self._lock_palabras:
+            self.palabras.clear()
+            self._palabras_por_texto.clear()
+            self._palabras_por_categoria.clear()
+            self.tableros.clear()
+            self.juegos.clear()
+            self._tableros_por_id.clear()
+            self._juegos_por_id.clear()
+            self._archivo = None  # Los IDs vuelven a empezar: el archivo anterior ya no aplica
+            with self._lock_sucios:
+                self._tableros_sucios.clear()
+                self._juegos_sucios.clear()
+            with self._lock_lideres:
+                self._inicializar_clasificaciones()
+            self._next_tablero_id = 1
+            self._next_juego_id = 1
+            self._inicializar_palabras()
 
 
 
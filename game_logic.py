@@ -1,35 +1,131 @@
-from board_generator import generar_tablero_con_palabras
-from data_storage import storage
+from board_generator import generar_tablero_con_palabras, generar_tablero_por_dificultad
+from config import DIFICULTADES, MAX_PALABRAS_TABLERO, TOP_LIDERES
+from async_storage import AsyncStorage
+import data_storage
+import asyncio
+import itertools
 import json
 
-def crear_juego():
-    """Crea un nuevo juego con tablero y palabras desde storage"""
+storage = data_storage.storage
+storage_async = AsyncStorage(storage)
+
+def configurar_storage(nuevo_storage):
+    """Reemplaza el backend de storage usado por la lógica del juego"""
+    global storage, storage_async
+    storage = nuevo_storage
+    storage_async = AsyncStorage(nuevo_storage)
+
+def crear_juego(dificultad=None, categoria="PROFESIONES", cantidad=None):
+    """
+    Crea un nuevo juego con tablero y palabras desde storage.
+    Con `cantidad` se usa una muestra aleatoria de la categoría en vez de todas sus palabras.
+    """
+    error = _validar_parametros(dificultad, cantidad)
+    if error:
+        return error
     
-    palabras = storage.obtener_palabras("PROFESIONES")
+    if cantidad is None:
+        palabras = storage.obtener_palabras(categoria)
+    else:
+        palabras = storage.muestrear_palabras(categoria, cantidad)
     
     if not palabras:
+        return _error_sin_palabras(storage.obtener_categorias())
+    error = _validar_palabras(palabras, categoria, cantidad)
+    if error:
+        return error
+    
+    try:
+        tablero, palabras_colocadas, puntuacion = _generar_tablero(palabras, dificultad)
+    except ValueError as e:
         return json.dumps({
-            "error": "No hay palabras disponibles"
+            "error": str(e)
         })
     
   
-    from board_generator import generar_tablero_garantizado
-    tablero, palabras_colocadas = generar_tablero_garantizado(palabras, intentos_maximos=20)
-    
-  
-    tablero_id = storage.guardar_tablero(tablero, palabras_colocadas)
+    tablero_id = storage.guardar_tablero(tablero, palabras_colocadas, categoria)
     
 
     juego_id = storage.crear_juego(tablero_id)
     
+    return _paquete_juego(juego_id, tablero_id, tablero, palabras_colocadas, puntuacion, categoria)
+
+async def crear_juego_async(dificultad=None, categoria="PROFESIONES", cantidad=None):
+    """Versión async de crear_juego; la generación corre fuera del event loop"""
+    error = _validar_parametros(dificultad, cantidad)
+    if error:
+        return error
+    
+    if cantidad is None:
+        palabras = await storage_async.obtener_palabras(categoria)
+    else:
+        palabras = await storage_async.muestrear_palabras(categoria, cantidad)
+    
+    if not palabras:
+        return _error_sin_palabras(await storage_async.obtener_categorias())
+    error = _validar_palabras(palabras, categoria, cantidad)
+    if error:
+        return error
+    
+    try:
+        tablero, palabras_colocadas, puntuacion = await asyncio.to_thread(_generar_tablero, palabras, dificultad)
+    except ValueError as e:
+        return json.dumps({
+            "error": str(e)
+        })
+    tablero_id = await storage_async.guardar_tablero(tablero, palabras_colocadas, categoria)
+    juego_id = await storage_async.crear_juego(tablero_id)
+    
+    return _paquete_juego(juego_id, tablero_id, tablero, palabras_colocadas, puntuacion, categoria)
+
+def _validar_parametros(dificultad, cantidad):
+    if dificultad is not None and dificultad not in DIFICULTADES:
+        return json.dumps({
+            "error": f"Dificultad desconocida: {dificultad}",
+            "dificultades": list(DIFICULTADES)
+        })
+    if cantidad is not None and not 1 <= cantidad <= MAX_PALABRAS_TABLERO:
+        return json.dumps({
+            "error": f"La cantidad de palabras debe estar entre 1 y {MAX_PALABRAS_TABLERO}"
+        })
+    return None
+
+def _error_sin_palabras(categorias):
+    return json.dumps({
+        "error": "No hay palabras disponibles",
+        "categorias": list(categorias)
+    })
+
+def _validar_palabras(palabras, categoria, cantidad):
+    if cantidad is not None and len(palabras) < cantidad:
+        return json.dumps({
+            "error": f"La categoría {categoria} solo tiene {len(palabras)} palabras"
+        })
+    if len(palabras) > MAX_PALABRAS_TABLERO:
+        return json.dumps({
+            "error": f"La categoría {categoria} tiene {len(palabras)} palabras; "
+                     f"indica una cantidad de hasta {MAX_PALABRAS_TABLERO}"
+        })
+    return None
+
+def _generar_tablero(palabras, dificultad=None):
+    if dificultad is None:
+        from board_generator import generar_tablero_garantizado
+        tablero, palabras_colocadas = generar_tablero_garantizado(palabras, intentos_maximos=20)
+        return tablero, palabras_colocadas, None
+    return generar_tablero_por_dificultad(palabras, dificultad)
+
+def _paquete_juego(juego_id, tablero_id, tablero, palabras_colocadas, puntuacion=None, categoria="PROFESIONES"):
     paquete = {
         "juego_id": juego_id,
         "tablero_id": tablero_id,
         "tablero": tablero,
         "palabras": palabras_colocadas,
-        "total_palabras": len(palabras_colocadas)
+        "total_palabras": len(palabras_colocadas),
+        "categoria": categoria
     }
-    
+    if puntuacion is not None:
+        paquete["dificultad"] = puntuacion
     return json.dumps(paquete)
 
 def resolver_juego(juego_id, tablero_id):
@@ -42,43 +138,137 @@ def resolver_juego(juego_id, tablero_id):
             "error": "Tablero no encontrado"
         })
     
-    tablero = tablero_obj.matriz
+    respuesta = _resolver_tablero(juego_id, tablero_obj)
+    storage.actualizar_juego(juego_id, finalizar=True)
+    return respuesta
+
+async def resolver_juego_async(juego_id, tablero_id):
+    """Versión async de resolver_juego"""
+    tablero_obj = await storage_async.obtener_tablero(tablero_id)
+    
+    if not tablero_obj:
+        return json.dumps({
+            "error": "Tablero no encontrado"
+        })
+    
+    respuesta = _resolver_tablero(juego_id, tablero_obj)
+    await storage_async.actualizar_juego(juego_id, finalizar=True)
+    return respuesta
+
+async def resolver_juego_stream(juego_id, tablero_id):
+    """
+    Generador async de la solución: produce un mensaje JSON por palabra en cuanto
+    se localiza y un mensaje final con el resumen; después finaliza el juego.
+    """
+    tablero_obj = await storage_async.obtener_tablero(tablero_id)
+    
+    if not tablero_obj:
+        yield json.dumps({
+            "error": "Tablero no encontrado"
+        })
+        return
+    
+    print(f"🔍 Resolviendo juego #{juego_id} en streaming ({len(tablero_obj.palabras)} palabras)")
+    faltantes = []
+    for solucion in resolver_incremental(tablero_obj.matriz, tablero_obj.palabras,
+                                         colocaciones=tablero_obj.colocaciones):
+        if solucion["posiciones"] is None:
+            faltantes.append(solucion["palabra"])
+            continue
+        yield json.dumps({"tipo": "SOLUCION", **solucion})
+    
+    await storage_async.actualizar_juego(juego_id, finalizar=True)
+    
+    encontradas = len(tablero_obj.palabras) - len(faltantes)
+    yield json.dumps({
+        "tipo": "FIN",
+        "mensaje": f"Juego resuelto: {encontradas}/{len(tablero_obj.palabras)} palabras encontradas",
+        "total_palabras": encontradas,
+        "palabras_faltantes": faltantes
+    })
+
+def resolver_incremental(tablero, palabras, excluir=(), colocaciones=None):
+    """
+    Genera la solución de cada palabra apenas se localiza, omitiendo las de `excluir`.
+    Si se conocen las colocaciones (tableros archivados) se evita la búsqueda.
+    """
+    excluidas = set(excluir)
+    colocaciones = colocaciones or {}
+    for palabra in palabras:
+        if palabra in excluidas:
+            continue
+        colocacion = colocaciones.get(palabra)
+        if colocacion:
+            fila, col, dir_fila, dir_col = colocacion
+            posiciones = [[fila + dir_fila * i, col + dir_col * i] for i in range(len(palabra))]
+        else:
+            posiciones = encontrar_palabra_en_tablero(tablero, palabra)
+        yield {
+            "palabra": palabra,
+            "posiciones": posiciones
+        }
+
+def obtener_pistas(juego_id, cantidad=1):
+    """Resuelve solo las primeras `cantidad` palabras aún no encontradas"""
+    juego = storage.obtener_juego(juego_id)
+    if not juego:
+        return json.dumps({
+            "error": "Juego no encontrado"
+        })
+    
+    tablero_obj = storage.obtener_tablero(juego.tablero_id)
+    if not tablero_obj:
+        return json.dumps({
+            "error": "Tablero no encontrado"
+        })
+    return _paquete_pistas(juego, tablero_obj, cantidad)
+
+async def obtener_pistas_async(juego_id, cantidad=1):
+    """Versión async de obtener_pistas"""
+    juego = await storage_async.obtener_juego(juego_id)
+    if not juego:
+        return json.dumps({
+            "error": "Juego no encontrado"
+        })
+    
+    tablero_obj = await storage_async.obtener_tablero(juego.tablero_id)
+    if not tablero_obj:
+        return json.dumps({
+            "error": "Tablero no encontrado"
+        })
+    return _paquete_pistas(juego, tablero_obj, cantidad)
+
+def _paquete_pistas(juego, tablero_obj, cantidad):
+    soluciones = resolver_incremental(tablero_obj.matriz, tablero_obj.palabras,
+                                      excluir=juego.palabras_encontradas,
+                                      colocaciones=tablero_obj.colocaciones)
+    pistas = [s for s in itertools.islice(soluciones, max(0, cantidad)) if s["posiciones"]]
+    return json.dumps({
+        "pistas": pistas,
+        "total_pistas": len(pistas)
+    })
+
+def _resolver_tablero(juego_id, tablero_obj):
     palabras = tablero_obj.palabras
     soluciones = []
+    faltantes = []
+    
+    print(f"🔍 Resolviendo juego #{juego_id} ({len(palabras)} palabras)")
     
-    print(f"\n{'='*60}")
-    print(f"🔍 RESOLVIENDO JUEGO #{juego_id}")
-    print(f"{'='*60}")
-    print(f"Total de palabras a buscar: {len(palabras)}")
-    print(f"Palabras: {palabras}")
-    print(f"{'='*60}\n")
-    
-
-    for i, palabra in enumerate(palabras, 1):
-        print(f"Buscando palabra {i}/{len(palabras)}: {palabra}")
-        posiciones = encontrar_palabra_en_tablero(tablero, palabra)
-        
-        if posiciones:
-            print(f"  ✓ Encontrada en posiciones: {posiciones}")
-            soluciones.append({
-                "palabra": palabra,
-                "posiciones": posiciones
-            })
+    for solucion in resolver_incremental(tablero_obj.matriz, palabras, colocaciones=tablero_obj.colocaciones):
+        if solucion["posiciones"]:
+            soluciones.append(solucion)
         else:
-            print(f"  ✗ NO ENCONTRADA - Esto es un ERROR")
+            faltantes.append(solucion["palabra"])
+            print(f"  ✗ NO ENCONTRADA: {solucion['palabra']} - Esto es un ERROR")
     
-    print(f"\n{'='*60}")
     print(f"✓ RESULTADO: {len(soluciones)}/{len(palabras)} palabras encontradas")
-    print(f"{'='*60}\n")
-    
- 
-    storage.actualizar_juego(juego_id, finalizar=True)
     
     return json.dumps({
         "soluciones": soluciones,
         "mensaje": f"Juego resuelto: {len(soluciones)}/{len(palabras)} palabras encontradas",
         "total_palabras": len(soluciones),
-        "palabras_faltantes": [p for p in palabras if p not in [s["palabra"] for s in soluciones]]
+        "palabras_faltantes": faltantes
     })
 
 def encontrar_palabra_en_tablero(tablero, palabra):
@@ -126,31 +316,53 @@ def encontrar_palabra_en_tablero(tablero, palabra):
 
 def actualizar_progreso(juego_id, palabra_encontrada):
     """Actualiza el progreso del jugador cuando encuentra una palabra"""
-    juego = storage.obtener_juego(juego_id)
-    
-    if not juego:
+    return actualizar_progreso_lote(juego_id, [palabra_encontrada])
+
+def actualizar_progreso_lote(juego_id, palabras_encontradas):
+    """Registra varias palabras encontradas con una sola actualización del storage"""
+    if not storage.actualizar_juego(juego_id, palabras_encontradas=palabras_encontradas):
         return json.dumps({
             "error": "Juego no encontrado"
         })
     
-   
-    storage.actualizar_juego(juego_id, palabra_encontrada=palabra_encontrada)
-    
- 
+    juego = storage.obtener_juego(juego_id)
     tablero = storage.obtener_tablero(juego.tablero_id)
-    total_palabras = len(tablero.palabras)
-    palabras_encontradas = len(juego.palabras_encontradas)
     
-    completado = palabras_encontradas >= total_palabras
-    if completado:
+    if len(juego.palabras_encontradas) >= len(tablero.palabras) and not juego.completado:
         storage.actualizar_juego(juego_id, finalizar=True)
+        juego = storage.obtener_juego(juego_id)
+    
+    return _paquete_progreso(juego, tablero)
+
+async def actualizar_progreso_async(juego_id, palabra_encontrada):
+    """Versión async de actualizar_progreso"""
+    return await actualizar_progreso_lote_async(juego_id, [palabra_encontrada])
+
+async def actualizar_progreso_lote_async(juego_id, palabras_encontradas):
+    """Versión async de actualizar_progreso_lote"""
+    if not await storage_async.actualizar_juego(juego_id, palabras_encontradas=palabras_encontradas):
+        return json.dumps({
+            "error": "Juego no encontrado"
+        })
+    
+    juego = await storage_async.obtener_juego(juego_id)
+    tablero = await storage_async.obtener_tablero(juego.tablero_id)
     
+    if len(juego.palabras_encontradas) >= len(tablero.palabras) and not juego.completado:
+        await storage_async.actualizar_juego(juego_id, finalizar=True)
+        juego = await storage_async.obtener_juego(juego_id)
+    
+    return _paquete_progreso(juego, tablero)
+
+def _paquete_progreso(juego, tablero):
+    total_palabras = len(tablero.palabras)
+    total_encontradas = len(juego.palabras_encontradas)
     return json.dumps({
         "mensaje": "Progreso guardado",
         "palabras_encontradas": juego.palabras_encontradas,
-        "total_encontradas": palabras_encontradas,
+        "total_encontradas": total_encontradas,
         "total_palabras": total_palabras,
-        "completado": completado,
+        "completado": total_encontradas >= total_palabras,
         "tiempo_transcurrido": juego.get_tiempo_transcurrido()
     })
 
@@ -164,7 +376,21 @@ def obtener_estado_juego(juego_id):
         })
     
     tablero = storage.obtener_tablero(juego.tablero_id)
+    return _paquete_estado(juego, tablero)
+
+async def obtener_estado_juego_async(juego_id):
+    """Versión async de obtener_estado_juego"""
+    juego = await storage_async.obtener_juego(juego_id)
     
+    if not juego:
+        return json.dumps({
+            "error": "Juego no encontrado"
+        })
+    
+    tablero = await storage_async.obtener_tablero(juego.tablero_id)
+    return _paquete_estado(juego, tablero)
+
+def _paquete_estado(juego, tablero):
     return json.dumps({
         "juego": juego.to_dict(),
         "tablero": tablero.to_dict() if tablero else None,
@@ -172,6 +398,32 @@ def obtener_estado_juego(juego_id):
         "total": len(tablero.palabras) if tablero else 0
     })
 
+def obtener_lideres(tablero_id=None, categoria=None, cantidad=TOP_LIDERES):
+    """Clasificación por menor tiempo: de un tablero, de una categoría o global"""
+    lideres = storage.obtener_lideres(tablero_id=tablero_id, categoria=categoria, cantidad=cantidad)
+    return _paquete_lideres(lideres, tablero_id, categoria)
+
+async def obtener_lideres_async(tablero_id=None, categoria=None, cantidad=TOP_LIDERES):
+    """Versión async de obtener_lideres"""
+    lideres = await storage_async.obtener_lideres(tablero_id=tablero_id, categoria=categoria, cantidad=cantidad)
+    return _paquete_lideres(lideres, tablero_id, categoria)
+
+def _paquete_lideres(lideres, tablero_id, categoria):
+    if tablero_id is not None:
+        ambito = {"tablero_id": tablero_id}
+    elif categoria is not None:
+        ambito = {"categoria": categoria}
+    else:
+        ambito = {"global": True}
+    return json.dumps({
+        "lideres": lideres,
+        **ambito
+    })
+
 def obtener_estadisticas():
     """Obtiene estadísticas generales del storage"""
-    return json.dumps(storage.obtener_estadisticas())
\ No newline at end of file
+    return json.dumps(storage.obtener_estadisticas())
+
+async def obtener_estadisticas_async():
+    """Versión async de obtener_estadisticas"""
+    return json.dumps(await storage_async.obtener_estadisticas())
\ No newline at end of file
@@ -0,0 +1,60 @@
+import time
+from typing import Dict, Tuple
+
+from config import RATE_LIMIT_SESION, RATE_LIMITS_COMANDO
+
+
+class CuboTokens:
+    """Token bucket: permite ráfagas de `capacidad` y repone `tasa` tokens por segundo"""
+    def __init__(self, capacidad: float, tasa: float, reloj=time.monotonic):
+        self.capacidad = capacidad
+        self.tasa = tasa
+        self.reloj = reloj
+        self.tokens = capacidad
+        self.ultimo = reloj()
+
+    def _reponer(self):
+        ahora = self.reloj()
+        self.tokens = min(self.capacidad, self.tokens + (ahora - self.ultimo) * self.tasa)
+        self.ultimo = ahora
+
+    def consumir(self, cantidad: float = 1) -> bool:
+        """Consume tokens si hay suficientes; retorna False si se debe rechazar"""
+        self._reponer()
+        if self.tokens >= cantidad:
+            self.tokens -= cantidad
+            return True
+        return False
+
+    def espera(self, cantidad: float = 1) -> float:
+        """Segundos hasta que haya `cantidad` tokens disponibles"""
+        self._reponer()
+        if self.tokens >= cantidad or self.tasa <= 0:
+            return 0.0
+        return (cantidad - self.tokens) / self.tasa
+
+
+class LimitadorSesion:
+    """Combina un cubo global por sesión con cubos por comando"""
+    def __init__(self, limite_sesion: Tuple[float, float] = RATE_LIMIT_SESION,
+                 limites_comando: Dict[str, Tuple[float, float]] = RATE_LIMITS_COMANDO,
+                 reloj=time.monotonic):
+        self.sesion = CuboTokens(*limite_sesion, reloj=reloj)
+        self.comandos = {
+            comando: CuboTokens(*limite, reloj=reloj)
+            for comando, limite in limites_comando.items()
+        }
+
+    def permitir_mensaje(self) -> bool:
+        """Aplica el límite global de mensajes de la sesión"""
+        return self.sesion.consumir()
+
+    def permitir_comando(self, comando: str) -> bool:
+        """Aplica el límite específico del comando, si tiene uno"""
+        cubo = self.comandos.get(comando)
+        return cubo is None or cubo.consumir()
+
+    def espera(self, comando: str = None) -> float:
+        """Segundos sugeridos antes de reintentar"""
+        cubo = self.comandos.get(comando, self.sesion)
+        return max(cubo.espera(), self.sesion.espera())
@@ -0,0 +1,143 @@
+"""
+Prueba de carga contra un servidor local de Sopa de Letras.
+
+Uso:
+    python prueba_carga.py --usuarios 200 --concurrencia 50 --rampa 10 --escenario completo
+
+Cada usuario virtual abre su propia conexión (una sesión del servidor, con sus
+propios límites de solicitudes), igual que un jugador real. Con
+--reutilizar-conexiones los usuarios se turnan las conexiones del pool y los
+comandos rechazados por límite se reintentan tras `reintentar_en`.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from ws_client import HOST, PORT, MetricasComandos, PoolConexiones
+
+
+async def iniciar(cliente) -> dict:
+    """START del escenario; si falla, el usuario se aborta en vez de jugar el juego de otro"""
+    juego = await cliente.start()
+    if "error" in juego:
+        raise RuntimeError(f"START rechazado: {juego['error']}")
+    return juego
+
+
+async def pensar(args):
+    """Simula el tiempo que tarda un jugador entre acciones"""
+    if args.pensar_max > 0:
+        await asyncio.sleep(random.uniform(args.pensar_min, args.pensar_max))
+
+
+async def escenario_completo(cliente, args):
+    """Inicia un juego y encuentra todas las palabras"""
+    juego = await iniciar(cliente)
+    for palabra in juego.get("palabras", []):
+        await pensar(args)
+        await cliente.encontrar(palabra)
+
+
+async def escenario_parcial(cliente, args):
+    """Encuentra algunas palabras, consulta el estado y pide la solución"""
+    juego = await iniciar(cliente)
+    palabras = juego.get("palabras", [])
+    for palabra in random.sample(palabras, k=len(palabras) // 2):
+        await pensar(args)
+        await cliente.encontrar(palabra)
+    await cliente.estado()
+    await pensar(args)
+    await cliente.resolver()
+
+
+async def escenario_resolver(cliente, args):
+    """Inicia un juego y pide la solución directamente"""
+    await iniciar(cliente)
+    await pensar(args)
+    await cliente.resolver()
+
+
+ESCENARIOS = {
+    "completo": escenario_completo,
+    "parcial": escenario_parcial,
+    "resolver": escenario_resolver,
+}
+
+
+async def usuario_virtual(indice, pool, args, escenario, errores):
+    """Ejecuta el escenario tras su retardo de rampa"""
+    if args.rampa > 0:
+        await asyncio.sleep(args.rampa * indice / args.usuarios)
+    try:
+        async with pool.cliente() as cliente:
+            await escenario(cliente, args)
+    except Exception as e:
+        errores.append(f"{type(e).__name__}: {e}")
+
+
+async def ejecutar_prueba(args) -> MetricasComandos:
+    """Lanza todos los usuarios virtuales y espera a que terminen"""
+    metricas = MetricasComandos()
+    pool = PoolConexiones(f"ws://{args.host}:{args.puerto}", args.concurrencia, metricas,
+                          reutilizar=args.reutilizar_conexiones,
+                          reintentos_limite=args.reintentos_limite if args.reutilizar_conexiones else 0)
+    escenario = ESCENARIOS[args.escenario]
+    errores = []
+
+    inicio = time.perf_counter()
+    try:
+        await asyncio.gather(*(
+            usuario_virtual(i, pool, args, escenario, errores)
+            for i in range(args.usuarios)
+        ))
+    finally:
+        await pool.cerrar()
+    duracion = time.perf_counter() - inicio
+
+    imprimir_reporte(metricas, duracion, errores)
+    return metricas
+
+
+def imprimir_reporte(metricas: MetricasComandos, duracion: float, errores):
+    """Imprime la tabla de latencias, errores y rechazos por límite por comando"""
+    resumen = metricas.resumen()
+    total = sum(r["total"] for r in resumen.values())
+    rechazos = sum(r["rechazos"] for r in resumen.values())
+
+    print("=" * 86)
+    print(f"{'COMANDO':<14}{'TOTAL':>8}{'ERRORES':>9}{'LIMITE':>8}"
+          f"{'P50 ms':>11}{'P95 ms':>11}{'P99 ms':>11}{'MAX ms':>11}")
+    print("-" * 86)
+    for comando, r in sorted(resumen.items()):
+        print(f"{comando:<14}{r['total']:>8}{r['errores']:>9}{r['rechazos']:>8}"
+              f"{r['p50_ms']:>11.2f}{r['p95_ms']:>11.2f}{r['p99_ms']:>11.2f}{r['max_ms']:>11.2f}")
+    print("-" * 86)
+    print(f"Duración: {duracion:.2f}s  |  Comandos: {total}  |  Throughput: {total / duracion:.1f} cmd/s")
+    if rechazos:
+        print(f"Rechazos por límite de solicitudes: {rechazos} (no cuentan como errores)")
+    if errores:
+        print(f"Usuarios con error: {len(errores)} (primero: {errores[0]})")
+    print("=" * 86)
+
+
+def parsear_argumentos(argv=None):
+    parser = argparse.ArgumentParser(description="Prueba de carga del servidor WebSocket")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--puerto", type=int, default=PORT)
+    parser.add_argument("--usuarios", type=int, default=100, help="usuarios virtuales totales")
+    parser.add_argument("--concurrencia", type=int, default=20, help="conexiones simultáneas máximas")
+    parser.add_argument("--rampa", type=float, default=5.0, help="segundos para arrancar a todos los usuarios")
+    parser.add_argument("--escenario", choices=sorted(ESCENARIOS), default="completo")
+    parser.add_argument("--pensar-min", type=float, default=0.05, help="tiempo mínimo de pensar (s)")
+    parser.add_argument("--pensar-max", type=float, default=0.5, help="tiempo máximo de pensar (s)")
+    parser.add_argument("--reutilizar-conexiones", action="store_true",
+                        help="los usuarios se turnan las conexiones del pool (comparten sesión y límites)")
+    parser.add_argument("--reintentos-limite", type=int, default=3,
+                        help="reintentos por comando rechazado por límite (solo con --reutilizar-conexiones)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    asyncio.run(ejecutar_prueba(parsear_argumentos()))
@@ -0,0 +1,296 @@
+import json
+import random
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from config import TOP_LIDERES
+from data_storage import CATEGORIAS_DEFAULT, Palabra, Tablero, Juego
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS palabras (
+    texto TEXT PRIMARY KEY,
+    categoria TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tableros (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    matriz TEXT NOT NULL,
+    palabras TEXT NOT NULL,
+    fecha_creacion TEXT NOT NULL,
+    categoria TEXT NOT NULL DEFAULT 'PROFESIONES'
+);
+CREATE TABLE IF NOT EXISTS juegos (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    tablero_id INTEGER NOT NULL,
+    tiempo_inicio TEXT NOT NULL,
+    tiempo_fin TEXT,
+    palabras_encontradas TEXT NOT NULL,
+    completado INTEGER NOT NULL DEFAULT 0,
+    duracion REAL,
+    categoria TEXT
+);
+"""
+
+# Columnas agregadas después de la primera versión del esquema
+COLUMNAS_NUEVAS = {
+    "tableros": [("categoria", "TEXT NOT NULL DEFAULT 'PROFESIONES'")],
+    "juegos": [("duracion", "REAL"), ("categoria", "TEXT")]
+}
+
+# duracion solo se llena en juegos terminados con todas las palabras: los índices parciales
+# mantienen cada clasificación como un recorrido ordenado de k filas
+INDICES = """
+CREATE INDEX IF NOT EXISTS palabras_categoria ON palabras (categoria);
+CREATE INDEX IF NOT EXISTS juegos_lideres ON juegos (duracion) WHERE duracion IS NOT NULL;
+CREATE INDEX IF NOT EXISTS juegos_lideres_tablero ON juegos (tablero_id, duracion) WHERE duracion IS NOT NULL;
+CREATE INDEX IF NOT EXISTS juegos_lideres_categoria ON juegos (categoria, duracion) WHERE duracion IS NOT NULL;
+"""
+
+
+class SQLiteStorage:
+    """
+    Storage compartido entre procesos sobre SQLite en modo WAL.
+    Expone la misma interfaz que DataStorage; cada hilo usa su propia conexión.
+    """
+
+    es_bloqueante = True  # E/S a disco: AsyncStorage lo ejecuta en su executor
+
+    def __init__(self, archivo: str = "sopa_letras.db"):
+        self.archivo = archivo
+        self._local = threading.local()
+
+        conexion = self._conexion()
+        conexion.executescript(ESQUEMA)
+        self._migrar_esquema()
+        conexion.executescript(INDICES)
+        self._inicializar_palabras()
+
+    def _conexion(self) -> sqlite3.Connection:
+        """Retorna la conexión del hilo actual, creándola si no existe"""
+        conexion = getattr(self._local, "conexion", None)
+        if conexion is None:
+            conexion = sqlite3.connect(self.archivo, timeout=30, isolation_level=None)
+            conexion.execute("PRAGMA journal_mode=WAL")
+            conexion.execute("PRAGMA synchronous=NORMAL")
+            self._local.conexion = conexion
+        return conexion
+
+    def _migrar_esquema(self):
+        """Agrega a una base existente las columnas que le falten"""
+        conexion = self._conexion()
+        for tabla, columnas in COLUMNAS_NUEVAS.items():
+            existentes = {fila[1] for fila in conexion.execute(f"PRAGMA table_info({tabla})")}
+            for nombre, tipo in columnas:
+                if nombre not in existentes:
+                    conexion.execute(f"ALTER TABLE {tabla} ADD COLUMN {nombre} {tipo}")
+
+    def _inicializar_palabras(self):
+        """Inserta las palabras por defecto si no existen"""
+        self._conexion().executemany(
+            "INSERT OR IGNORE INTO palabras (texto, categoria) VALUES (?, ?)",
+            [(texto, categoria) for categoria, textos in CATEGORIAS_DEFAULT.items() for texto in textos]
+        )
+
+    @staticmethod
+    def _fila_a_tablero(fila) -> Tablero:
+        tablero = Tablero(fila[0], json.loads(fila[1]), json.loads(fila[2]), categoria=fila[4])
+        tablero.fecha_creacion = datetime.fromisoformat(fila[3])
+        return tablero
+
+    @staticmethod
+    def _fila_a_juego(fila) -> Juego:
+        juego = Juego(fila[0], fila[1])
+        juego.tiempo_inicio = datetime.fromisoformat(fila[2])
+        juego.tiempo_fin = datetime.fromisoformat(fila[3]) if fila[3] else None
+        juego.palabras_encontradas = json.loads(fila[4])
+        juego.completado = bool(fila[5])
+        return juego
+
+    # ---------------- Palabras ----------------
+
+    def agregar_palabra(self, texto: str, categoria: str = "PROFESIONES"):
+        """Agrega una palabra si no existe"""
+        cursor = self._conexion().execute(
+            "INSERT OR IGNORE INTO palabras (texto, categoria) VALUES (?, ?)",
+            (texto.upper(), categoria)
+        )
+        return cursor.rowcount == 1
+
+    def obtener_palabras(self, categoria: str = None) -> List[str]:
+        """Obtiene palabras, opcionalmente filtradas por categoría"""
+        if categoria:
+            filas = self._conexion().execute(
+                "SELECT texto FROM palabras WHERE categoria = ? ORDER BY rowid", (categoria,)
+            )
+        else:
+            filas = self._conexion().execute("SELECT texto FROM palabras ORDER BY rowid")
+        return [fila[0] for fila in filas]
+
+    def muestrear_palabras(self, categoria: str, cantidad: int) -> List[str]:
+        """Elige `cantidad` palabras distintas al azar de una categoría (todas si hay menos)"""
+        textos = self.obtener_palabras(categoria)
+        return random.sample(textos, min(cantidad, len(textos)))
+
+    def obtener_categorias(self) -> Dict[str, int]:
+        """Retorna cada categoría con su cantidad de palabras"""
+        return dict(self._conexion().execute(
+            "SELECT categoria, COUNT(*) FROM palabras GROUP BY categoria ORDER BY MIN(rowid)"
+        ))
+
+    def buscar_palabra(self, texto: str) -> Optional[Palabra]:
+        """Busca una palabra por texto"""
+        fila = self._conexion().execute(
+            "SELECT texto, categoria FROM palabras WHERE texto = ?", (texto.upper(),)
+        ).fetchone()
+        return Palabra(fila[0], fila[1]) if fila else None
+
+    # ---------------- Tableros ----------------
+
+    def guardar_tablero(self, matriz: List[List[str]], palabras: List[str], categoria: str = "PROFESIONES") -> int:
+        """Guarda un tablero y retorna su ID"""
+        cursor = self._conexion().execute(
+            "INSERT INTO tableros (matriz, palabras, fecha_creacion, categoria) VALUES (?, ?, ?, ?)",
+            (json.dumps(matriz), json.dumps(palabras), datetime.now().isoformat(), categoria)
+        )
+        return cursor.lastrowid
+
+    def obtener_tablero(self, tablero_id: int) -> Optional[Tablero]:
+        """Busca un tablero por ID"""
+        fila = self._conexion().execute(
+            "SELECT id, matriz, palabras, fecha_creacion, categoria FROM tableros WHERE id = ?", (tablero_id,)
+        ).fetchone()
+        return self._fila_a_tablero(fila) if fila else None
+
+    def listar_tableros(self) -> List[Tablero]:
+        """Retorna todos los tableros"""
+        filas = self._conexion().execute(
+            "SELECT id, matriz, palabras, fecha_creacion, categoria FROM tableros ORDER BY id"
+        )
+        return [self._fila_a_tablero(fila) for fila in filas]
+
+    # ---------------- Juegos ----------------
+
+    def crear_juego(self, tablero_id: int) -> int:
+        """Crea un nuevo juego y retorna su ID"""
+        cursor = self._conexion().execute(
+            "INSERT INTO juegos (tablero_id, tiempo_inicio, palabras_encontradas) VALUES (?, ?, ?)",
+            (tablero_id, datetime.now().isoformat(), "[]")
+        )
+        return cursor.lastrowid
+
+    def obtener_juego(self, juego_id: int) -> Optional[Juego]:
+        """Busca un juego por ID"""
+        fila = self._conexion().execute(
+            "SELECT id, tablero_id, tiempo_inicio, tiempo_fin, palabras_encontradas, completado "
+            "FROM juegos WHERE id = ?", (juego_id,)
+        ).fetchone()
+        return self._fila_a_juego(fila) if fila else None
+
+    def actualizar_juego(self, juego_id: int, palabra_encontrada: str = None, finalizar: bool = False,
+                         palabras_encontradas: List[str] = None):
+        """Actualiza el estado de un juego dentro de una transacción"""
+        conexion = self._conexion()
+        conexion.execute("BEGIN IMMEDIATE")
+        try:
+            juego = self.obtener_juego(juego_id)
+            if not juego:
+                conexion.execute("ROLLBACK")
+                return False
+
+            if palabra_encontrada:
+                juego.agregar_palabra_encontrada(palabra_encontrada)
+            for palabra in filter(None, palabras_encontradas or ()):
+                juego.agregar_palabra_encontrada(palabra)
+
+            duracion = categoria = None
+            if finalizar and not juego.completado:
+                juego.finalizar()
+                tablero = self.obtener_tablero(juego.tablero_id)
+                if tablero is not None and set(tablero.palabras) <= set(juego.palabras_encontradas):
+                    duracion = juego.get_tiempo_transcurrido()
+                    categoria = tablero.categoria
+
+            conexion.execute(
+                "UPDATE juegos SET palabras_encontradas = ?, completado = ?, tiempo_fin = ?, "
+                "duracion = COALESCE(?, duracion), categoria = COALESCE(?, categoria) WHERE id = ?",
+                (json.dumps(juego.palabras_encontradas), int(juego.completado),
+                 juego.tiempo_fin.isoformat() if juego.tiempo_fin else None, duracion, categoria, juego_id)
+            )
+            conexion.execute("COMMIT")
+            return True
+        except Exception:
+            conexion.execute("ROLLBACK")
+            raise
+
+    def listar_juegos(self) -> List[Juego]:
+        """Retorna todos los juegos"""
+        filas = self._conexion().execute(
+            "SELECT id, tablero_id, tiempo_inicio, tiempo_fin, palabras_encontradas, completado "
+            "FROM juegos ORDER BY id"
+        )
+        return [self._fila_a_juego(fila) for fila in filas]
+
+    def obtener_lideres(self, tablero_id: int = None, categoria: str = None,
+                        cantidad: int = TOP_LIDERES) -> List[dict]:
+        """Mejores tiempos de un tablero, de una categoría o globales (en ese orden de prioridad)"""
+        consulta = "SELECT duracion, id, tablero_id FROM juegos WHERE duracion IS NOT NULL"
+        parametros = []
+        if tablero_id is not None:
+            consulta += " AND tablero_id = ?"
+            parametros.append(tablero_id)
+        elif categoria is not None:
+            consulta += " AND categoria = ?"
+            parametros.append(categoria)
+        consulta += " ORDER BY duracion, id LIMIT ?"
+        parametros.append(cantidad)
+
+        return [
+            {"posicion": posicion, "juego_id": juego_id, "tablero_id": tablero, "tiempo": duracion}
+            for posicion, (duracion, juego_id, tablero) in
+            enumerate(self._conexion().execute(consulta, parametros), start=1)
+        ]
+
+    # ---------------- Utilidades ----------------
+
+    def obtener_estadisticas(self):
+        """Retorna estadísticas del storage"""
+        conexion = self._conexion()
+        return {
+            "total_palabras": conexion.execute("SELECT COUNT(*) FROM palabras").fetchone()[0],
+            "total_tableros": conexion.execute("SELECT COUNT(*) FROM tableros").fetchone()[0],
+            "total_juegos": conexion.execute("SELECT COUNT(*) FROM juegos").fetchone()[0],
+            "juegos_completados": conexion.execute(
+                "SELECT COUNT(*) FROM juegos WHERE completado = 1").fetchone()[0]
+        }
+
+    def exportar_datos(self, archivo: str = "datos_juego.json"):
+        """Exporta todos los datos a un archivo JSON"""
+        datos = {
+            "palabras": [
+                Palabra(texto, categoria).to_dict() for texto, categoria in
+                self._conexion().execute("SELECT texto, categoria FROM palabras ORDER BY rowid")
+            ],
+            "tableros": [t.to_dict() for t in self.listar_tableros()],
+            "juegos": [j.to_dict() for j in self.listar_juegos()]
+        }
+
+        with open(archivo, 'w', encoding='utf-8') as f:
+            json.dump(datos, f, indent=2, ensure_ascii=False)
+
+        print(f"✓ Datos exportados a {archivo}")
+
+    def limpiar_datos(self):
+        """Borra todas las tablas (útil para testing)"""
+        self._conexion().executescript(
+            "DELETE FROM palabras; DELETE FROM tableros; DELETE FROM juegos;"
+            "DELETE FROM sqlite_sequence;"
+        )
+        self._inicializar_palabras()
+
+    def cerrar(self):
+        """Cierra la conexión del hilo actual"""
+        conexion = getattr(self._local, "conexion", None)
+        if conexion is not None:
+            conexion.close()
+            self._local.conexion = None
@@ -3,7 +3,15 @@ Suite de Tests Unitarios para Sopa de Letras
 """
 
 import unittest
+import asyncio
 import json
+import os
+import pickle
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
 
 from board_generator import (
     crear_tablero_vacio,
@@ -11,19 +19,38 @@ from board_generator import (
     colocar_palabra_en_tablero,
     intentar_colocar_palabra,
     generar_tablero_garantizado,
-    rellenar_espacios_vacios
+    rellenar_espacios_vacios,
+    calcular_dificultad,
+    generar_tablero_por_dificultad,
+    verificar_factibilidad
 )
 
-from data_storage import DataStorage, Palabra, Tablero, Juego
+from data_storage import DataStorage, Palabra, Tablero, Juego, VERSION_SNAPSHOT
+from archivo_tableros import ArchivoTableros
+from clasificacion import TablaLideres
+from sqlite_storage import SQLiteStorage
+from async_storage import AsyncStorage
 
 from game_logic import (
     encontrar_palabra_en_tablero,
     crear_juego,
     resolver_juego,
-    actualizar_progreso
+    actualizar_progreso,
+    resolver_incremental,
+    obtener_pistas
 )
 
-from config import BOARD_SIZE, WORDS
+from config import BOARD_SIZE, WORDS, DIFICULTADES, RATE_LIMITS_COMANDO
+
+from ws_client import ClienteSopa, MetricasComandos
+from limitador import CuboTokens, LimitadorSesion
+
+import game_logic
+import ws_server
+import websockets
+from websockets.extensions.permessage_deflate import PerMessageDeflate
+from websockets.frames import Frame, Opcode
+from compresion import DeflateConUmbral, MetricasCompresion, comando_actual, crear_extensiones
 
 
 # ================================================================
@@ -83,6 +110,43 @@ class TestBoardGenerator(unittest.TestCase):
         self.assertEqual(len(palabras_colocadas), len(palabras))
         self.assertEqual(len(tablero), BOARD_SIZE)
 
+    # ------------------------------------------------------------
+    def test_factibilidad_falla_rapido(self):
+        verificar_factibilidad(WORDS)
+        with self.assertRaises(ValueError):
+            generar_tablero_garantizado(["A" * (BOARD_SIZE + 1)])
+        with self.assertRaises(ValueError):
+            generar_tablero_por_dificultad(["X" * BOARD_SIZE] * (BOARD_SIZE + 1))
+
+    # ------------------------------------------------------------
+    def test_calcular_dificultad(self):
+        facil = calcular_dificultad([("HOLA", 0, 0, 0, 1), ("MUNDO", 1, 0, 0, 1)])
+        self.assertEqual(facil["puntuacion"], 0.0)
+
+        # Inversa diagonal que comparte la H de HOLA
+        dificil = calcular_dificultad([("HOLA", 0, 0, 0, 1), ("OH", 1, 1, -1, -1)], 1.0)
+        self.assertEqual(dificil["direcciones"], 0.5)
+        self.assertAlmostEqual(dificil["solapamiento"], 1 / 6, places=3)
+        self.assertGreater(dificil["puntuacion"], facil["puntuacion"])
+
+    # ------------------------------------------------------------
+    def test_generar_tablero_por_dificultad(self):
+        for nivel, objetivo in DIFICULTADES.items():
+            tablero, colocadas, dificultad = generar_tablero_por_dificultad(WORDS, nivel)
+            self.assertCountEqual(colocadas, WORDS)
+            for palabra in WORDS:
+                self.assertIsNotNone(encontrar_palabra_en_tablero(tablero, palabra))
+            self.assertLess(abs(dificultad["puntuacion"] - objetivo), 0.15)
+            self.assertTrue(dificultad["objetivo_alcanzado"])
+
+    # ------------------------------------------------------------
+    def test_dificultad_sin_intentos_puntua_el_respaldo(self):
+        tablero, colocadas, dificultad = generar_tablero_por_dificultad(WORDS, "DIFICIL", max_intentos=0)
+        for palabra in colocadas:
+            self.assertIsNotNone(encontrar_palabra_en_tablero(tablero, palabra))
+        self.assertIsInstance(dificultad["puntuacion"], float)
+        self.assertFalse(dificultad["objetivo_alcanzado"])
+
 
 # ================================================================
 # TESTS: DATA STORAGE
@@ -127,6 +191,16 @@ class TestDataStorage(unittest.TestCase):
         cat1 = self.storage.obtener_palabras("CAT1")
         self.assertIn("PALABRA1", cat1)
 
+    # ------------------------------------------------------------
+    def test_muestrear_palabras_por_categoria(self):
+        animales = self.storage.obtener_palabras("ANIMALES")
+        muestra = self.storage.muestrear_palabras("ANIMALES", 5)
+        self.assertEqual(len(set(muestra)), 5)
+        self.assertTrue(set(muestra) <= set(animales))
+        self.assertEqual(len(self.storage.muestrear_palabras("PROFESIONES", 100)), 15)
+        self.assertEqual(self.storage.muestrear_palabras("NO_EXISTE", 3), [])
+        self.assertEqual(self.storage.obtener_categorias()["PROFESIONES"], 15)
+
     # ------------------------------------------------------------
     def test_guardar_y_obtener_tablero(self):
         matriz = [['A'] * 15 for _ in range(15)]
@@ -148,12 +222,340 @@ class TestDataStorage(unittest.TestCase):
         juego = self.storage.obtener_juego(juego_id)
         self.assertIn("TEST", juego.palabras_encontradas)
 
+    # ------------------------------------------------------------
+    def test_snapshot_ida_y_vuelta(self):
+        self.storage.agregar_palabra("PERRO", "ANIMALES")
+        tablero_id = self.storage.guardar_tablero([['A', 'B'], ['C', 'D']], ["AB"])
+        self.storage.crear_juego(tablero_id)
+
+        with tempfile.TemporaryDirectory() as directorio:
+            archivo = os.path.join(directorio, "snapshot.pkl")
+            self.storage.guardar_snapshot(archivo)
+
+            restaurado = DataStorage()
+            self.assertTrue(restaurado.cargar_snapshot(archivo))
+            self.assertFalse(restaurado.cargar_snapshot(os.path.join(directorio, "no_existe.pkl")))
+
+        self.assertIn("PERRO", restaurado.obtener_palabras("ANIMALES"))
+        self.assertEqual(restaurado.obtener_tablero(tablero_id).matriz, [['A', 'B'], ['C', 'D']])
+        self.assertEqual(restaurado.guardar_tablero([['X']], ["X"]), tablero_id + 1)
+        self.assertEqual(restaurado.crear_juego(1), 2)
+
+    # ------------------------------------------------------------
+    def test_snapshot_antiguo_conserva_categorias(self):
+        with tempfile.TemporaryDirectory() as directorio:
+            archivo = os.path.join(directorio, "snapshot.pkl")
+            with open(archivo, 'wb') as f:
+                pickle.dump({
+                    "version": VERSION_SNAPSHOT,
+                    "palabras": [(texto, "PROFESIONES") for texto in WORDS] + [("PINTOR", "PROFESIONES")],
+                    "tableros": [],
+                    "next_tablero_id": 1,
+                    "next_juego_id": 1
+                }, f)
+            self.assertTrue(self.storage.cargar_snapshot(archivo))
+
+        self.assertEqual(len(self.storage.obtener_palabras("ANIMALES")), 20)
+        self.assertIn("PINTOR", self.storage.obtener_palabras("PROFESIONES"))
+        self.assertEqual(len(self.storage.obtener_palabras("PROFESIONES")), len(WORDS) + 1)
+
+    # ------------------------------------------------------------
+    def test_checkpoint_incremental(self):
+        tablero_id = self.storage.guardar_tablero([['A', 'B'], ['C', 'D']], ["AB"])
+        juego_id = self.storage.crear_juego(tablero_id)
+
+        with tempfile.TemporaryDirectory() as directorio:
+            archivo = os.path.join(directorio, "checkpoint.jsonl")
+            self.assertEqual(self.storage.guardar_checkpoint(archivo), 2)
+            self.assertEqual(self.storage.guardar_checkpoint(archivo), 0)
+
+            self.storage.actualizar_juego(juego_id, palabra_encontrada="AB", finalizar=True)
+            self.assertEqual(self.storage.guardar_checkpoint(archivo), 1)
+
+            with open(archivo, encoding='utf-8') as f:
+                registros = [json.loads(linea) for linea in f]
+
+            # Más versiones del mismo juego: al cargarlo se compacta a un registro por id
+            for _ in range(3):
+                self.storage.actualizar_juego(juego_id, palabra_encontrada="AB")
+                self.storage.guardar_checkpoint(archivo)
+            restaurado = DataStorage()
+            self.assertEqual(restaurado.cargar_checkpoint(archivo), 2)
+            with open(archivo, encoding='utf-8') as f:
+                self.assertEqual(sum(1 for _ in f), 2)
+
+        self.assertEqual([r["tipo"] for r in registros], ["tablero", "juego", "juego"])
+        self.assertTrue(registros[-1]["completado"])
+        juego = restaurado.obtener_juego(juego_id)
+        self.assertTrue(juego.completado)
+        self.assertEqual(juego.palabras_encontradas, ["AB"])
+        self.assertEqual(restaurado.obtener_tablero(tablero_id).matriz, [['A', 'B'], ['C', 'D']])
+        self.assertEqual(restaurado.obtener_estadisticas()["juegos_completados"], 1)
+        self.assertGreater(restaurado.crear_juego(tablero_id), juego_id)
+
+    # ------------------------------------------------------------
+    def test_archivo_tableros_mmap(self):
+        tablero, colocadas = generar_tablero_garantizado(WORDS)
+        ids = [self.storage.guardar_tablero(tablero, colocadas) for _ in range(2)]
+
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = os.path.join(directorio, "tableros.bin")
+            archivo = ArchivoTableros(ruta)
+            self.storage.configurar_archivo(archivo, tableros_en_memoria=4)
+            ids += [self.storage.guardar_tablero(tablero, colocadas) for _ in range(8)]
+            self.storage.esperar_archivado()
+
+            self.assertLessEqual(len(self.storage.listar_tableros()), 4)
+            self.assertIn(ids[0], archivo)
+            self.assertEqual(self.storage.obtener_estadisticas()["total_tableros"], 10)
+
+            historico = self.storage.obtener_tablero(ids[0])
+            self.assertEqual(historico.matriz, tablero)
+            self.assertEqual(historico.palabras, colocadas)
+            for palabra in colocadas:
+                fila, col, dir_fila, dir_col = historico.colocaciones[palabra]
+                letras = [tablero[fila + dir_fila * i][col + dir_col * i] for i in range(len(palabra))]
+                self.assertEqual("".join(letras), palabra)
+            archivo.cerrar()
+
+            # Al reabrir, el índice se reconstruye desde el archivo
+            reabierto = ArchivoTableros(ruta)
+            self.assertEqual(len(reabierto), len(archivo._indice))
+            self.assertEqual(reabierto.obtener(ids[1]).matriz, tablero)
+            self.assertIsNone(reabierto.obtener(ids[-1]))
+
+            # Un storage nuevo (reinicio sin snapshot) no reutiliza ids archivados
+            reiniciado = DataStorage()
+            reiniciado.configurar_archivo(reabierto, tableros_en_memoria=4)
+            nuevo_id = reiniciado.guardar_tablero(tablero, colocadas)
+            self.assertGreater(nuevo_id, reabierto.ultimo_id)
+            with self.assertRaises(ValueError):
+                reabierto.agregar(reabierto.obtener(ids[0]))
+            reabierto.cerrar()
+
+    # ------------------------------------------------------------
+    def test_snapshot_antiguo_no_duplica_archivados(self):
+        tablero, colocadas = generar_tablero_garantizado(WORDS)
+        for _ in range(6):
+            self.storage.guardar_tablero(tablero, colocadas)
+
+        with tempfile.TemporaryDirectory() as directorio:
+            snapshot = os.path.join(directorio, "snapshot.pkl")
+            ruta = os.path.join(directorio, "tableros.bin")
+            self.storage.guardar_snapshot(snapshot)
+
+            # Primer reinicio: se archivan los más antiguos; el tablero 1 ya quedó escrito
+            # por un lote interrumpido y no debe atascar el archivado
+            archivo = ArchivoTableros(ruta)
+            primero = DataStorage()
+            primero.configurar_archivo(archivo, tableros_en_memoria=2)
+            primero.cargar_snapshot(snapshot)
+            archivo.agregar(primero.obtener_tablero(1))
+            primero.guardar_tablero(tablero, colocadas)
+            primero.esperar_archivado()
+            self.assertLessEqual(len(primero.listar_tableros()), 2)
+            archivo.cerrar()
+
+            # Caída y segundo reinicio con el mismo snapshot (ya viejo)
+            archivo = ArchivoTableros(ruta)
+            segundo = DataStorage()
+            segundo.configurar_archivo(archivo, tableros_en_memoria=2)
+            segundo.cargar_snapshot(snapshot)
+            self.assertEqual(segundo.obtener_estadisticas()["total_tableros"], 6)
+            segundo.guardar_tablero(tablero, colocadas)
+            segundo.esperar_archivado()
+            self.assertLessEqual(len(segundo.listar_tableros()), 2)
+            self.assertEqual(segundo.obtener_estadisticas()["total_tableros"], 7)
+            archivo.cerrar()
+
+    # ------------------------------------------------------------
+    def test_clasificaciones_incrementales(self):
+        animales = self.storage.guardar_tablero([['A', 'B'], ['C', 'D']], ["AB", "CD"], "ANIMALES")
+        profesiones = self.storage.guardar_tablero([['A', 'B'], ['C', 'D']], ["AB"])
+
+        for tablero_id, segundos in [(animales, 30), (animales, 10), (profesiones, 20)]:
+            juego_id = self.storage.crear_juego(tablero_id)
+            self.storage.obtener_juego(juego_id).tiempo_inicio = datetime.now() - timedelta(seconds=segundos)
+            self.storage.actualizar_juego(juego_id, palabras_encontradas=["AB", "CD"], finalizar=True)
+
+        # Resuelto sin encontrar todo: cuenta como completado pero no clasifica
+        resuelto = self.storage.crear_juego(animales)
+        self.storage.actualizar_juego(resuelto, palabra_encontrada="AB", finalizar=True)
+        self.storage.actualizar_juego(resuelto, finalizar=True)
+
+        self.assertEqual(self.storage.obtener_estadisticas()["juegos_completados"], 4)
+        self.assertEqual([m["juego_id"] for m in self.storage.obtener_lideres()], [2, 3, 1])
+        self.assertEqual([m["juego_id"] for m in self.storage.obtener_lideres(tablero_id=animales)], [2, 1])
+        self.assertEqual([m["juego_id"] for m in self.storage.obtener_lideres(categoria="PROFESIONES")], [3])
+        self.assertEqual(len(self.storage.obtener_lideres(cantidad=1)), 1)
+        self.assertEqual(self.storage.obtener_lideres(categoria="DEPORTES"), [])
+
+    # ------------------------------------------------------------
+    def test_tabla_lideres_limitada(self):
+        tabla = TablaLideres(3)
+        self.assertEqual(tabla.registrar(5.0, 1, 1), 1)
+        self.assertEqual(tabla.registrar(1.0, 2, 1), 1)
+        self.assertEqual(tabla.registrar(3.0, 3, 1), 2)
+        self.assertIsNone(tabla.registrar(9.0, 4, 1))
+        self.assertEqual(tabla.registrar(2.0, 5, 1), 2)
+        self.assertEqual([m["tiempo"] for m in tabla.top()], [1.0, 2.0, 3.0])
+
     # ------------------------------------------------------------
     def test_obtener_estadisticas(self):
         stats = self.storage.obtener_estadisticas()
         self.assertIn("total_palabras", stats)
 
 
+# ================================================================
+# TESTS: CONCURRENCIA EN DATA STORAGE
+# ================================================================
+class TestDataStorageConcurrente(unittest.TestCase):
+
+    def setUp(self):
+        self.intervalo = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)  # Fuerza cambios de hilo frecuentes
+
+    def tearDown(self):
+        sys.setswitchinterval(self.intervalo)
+
+    def _en_hilos(self, cantidad, funcion):
+        barrera = threading.Barrier(cantidad)
+
+        def ejecutar(indice):
+            barrera.wait()
+            funcion(indice)
+
+        hilos = [threading.Thread(target=ejecutar, args=(i,)) for i in range(cantidad)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+
+    # ------------------------------------------------------------
+    def test_ids_unicos_bajo_contencion(self):
+        storage = DataStorage()
+        ids_juegos = [[] for _ in range(16)]
+        ids_tableros = [[] for _ in range(16)]
+
+        def crear(indice):
+            for _ in range(500):
+                ids_tableros[indice].append(storage.guardar_tablero([['A']], ["A"]))
+                ids_juegos[indice].append(storage.crear_juego(1))
+
+        self._en_hilos(16, crear)
+
+        todos_juegos = [i for ids in ids_juegos for i in ids]
+        todos_tableros = [i for ids in ids_tableros for i in ids]
+        self.assertEqual(sorted(todos_juegos), list(range(1, 8001)))
+        self.assertEqual(sorted(todos_tableros), list(range(1, 8001)))
+        self.assertEqual([j.id for j in storage.listar_juegos()], list(range(1, 8001)))
+        self.assertEqual(storage.obtener_juego(4321).id, 4321)
+
+    # ------------------------------------------------------------
+    def test_sin_actualizaciones_perdidas(self):
+        storage = DataStorage()
+        juego_id = storage.crear_juego(1)
+
+        def encontrar(indice):
+            for n in range(200):
+                storage.actualizar_juego(juego_id, palabra_encontrada=f"P{indice}-{n}")
+                storage.actualizar_juego(juego_id, palabra_encontrada=f"P{(indice + 1) % 16}-{n}")
+
+        self._en_hilos(16, encontrar)
+
+        encontradas = storage.obtener_juego(juego_id).palabras_encontradas
+        self.assertEqual(len(encontradas), 16 * 200)
+        self.assertEqual(len(set(encontradas)), len(encontradas))
+
+
+# ================================================================
+# TESTS: SQLITE STORAGE
+# ================================================================
+class TestSQLiteStorage(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.archivo = os.path.join(self.directorio.name, "test.db")
+        self.storage = SQLiteStorage(self.archivo)
+
+    def tearDown(self):
+        self.storage.cerrar()
+        self.directorio.cleanup()
+
+    # ------------------------------------------------------------
+    def test_palabras_por_defecto(self):
+        self.assertEqual(len(self.storage.obtener_palabras("PROFESIONES")), 15)
+
+    # ------------------------------------------------------------
+    def test_tablero_y_juego_compartidos(self):
+        tablero_id = self.storage.guardar_tablero([['A', 'B'], ['C', 'D']], ["AB"])
+        juego_id = self.storage.crear_juego(tablero_id)
+
+        otro = SQLiteStorage(self.archivo)
+        try:
+            self.assertEqual(otro.obtener_tablero(tablero_id).matriz, [['A', 'B'], ['C', 'D']])
+            otro.actualizar_juego(juego_id, palabra_encontrada="AB", finalizar=True)
+        finally:
+            otro.cerrar()
+
+        juego = self.storage.obtener_juego(juego_id)
+        self.assertEqual(juego.palabras_encontradas, ["AB"])
+        self.assertTrue(juego.completado)
+        self.assertEqual(self.storage.obtener_estadisticas()["juegos_completados"], 1)
+
+    # ------------------------------------------------------------
+    def test_lideres_solo_juegos_completos(self):
+        tablero_id = self.storage.guardar_tablero([['A', 'B'], ['C', 'D']], ["AB", "CD"], "ANIMALES")
+        completo = self.storage.crear_juego(tablero_id)
+        self.storage.actualizar_juego(completo, palabras_encontradas=["AB", "", "CD"], finalizar=True)
+        self.assertEqual(self.storage.obtener_juego(completo).palabras_encontradas, ["AB", "CD"])
+        resuelto = self.storage.crear_juego(tablero_id)
+        self.storage.actualizar_juego(resuelto, finalizar=True)
+
+        self.assertEqual(self.storage.obtener_tablero(tablero_id).categoria, "ANIMALES")
+        for filtros in [{}, {"tablero_id": tablero_id}, {"categoria": "ANIMALES"}]:
+            self.assertEqual([m["juego_id"] for m in self.storage.obtener_lideres(**filtros)], [completo])
+        self.assertEqual(self.storage.obtener_lideres(categoria="PROFESIONES"), [])
+
+
+# ================================================================
+# TESTS: ASYNC STORAGE
+# ================================================================
+class StorageLento:
+    es_bloqueante = True
+
+    def __init__(self):
+        self.lecturas = 0
+
+    def obtener_juego(self, juego_id):
+        self.lecturas += 1
+        time.sleep(0.05)
+        return Juego(juego_id, 1)
+
+
+class TestAsyncStorage(unittest.TestCase):
+
+    # ------------------------------------------------------------
+    def test_lecturas_concurrentes_se_agrupan(self):
+        lento = StorageLento()
+        storage_async = AsyncStorage(lento)
+
+        async def leer():
+            return await asyncio.gather(*(storage_async.obtener_juego(7) for _ in range(10)))
+
+        juegos = asyncio.run(leer())
+        storage_async.cerrar()
+        self.assertEqual(lento.lecturas, 1)
+        self.assertTrue(all(j.id == 7 for j in juegos))
+
+    # ------------------------------------------------------------
+    def test_storage_en_memoria_sin_executor(self):
+        storage_async = AsyncStorage(DataStorage())
+        self.assertFalse(storage_async.bloqueante)
+        tablero_id = asyncio.run(storage_async.guardar_tablero([['A']], ["A"]))
+        self.assertEqual(asyncio.run(storage_async.obtener_tablero(tablero_id)).palabras, ["A"])
+
+
 # ================================================================
 # TESTS: GAME LOGIC
 # ================================================================
@@ -195,6 +597,34 @@ class TestGameLogic(unittest.TestCase):
         tablero = [['X']*5 for _ in range(5)]
         self.assertIsNone(encontrar_palabra_en_tablero(tablero, "HOLA"))
 
+    # ------------------------------------------------------------
+    def test_resolver_incremental_es_perezoso(self):
+        tablero = [['H','O','L','A','X']] + [['X']*5 for _ in range(4)]
+        soluciones = resolver_incremental(tablero, ["HOLA", "NADA"], excluir=["XX"])
+        primera = next(soluciones)
+        self.assertEqual(primera["palabra"], "HOLA")
+        self.assertEqual(primera["posiciones"][0], [0, 0])
+        self.assertIsNone(next(soluciones)["posiciones"])
+
+    # ------------------------------------------------------------
+    def test_pistas_excluyen_encontradas(self):
+        datos = json.loads(crear_juego())
+        actualizar_progreso(datos["juego_id"], datos["palabras"][0])
+
+        pistas = json.loads(obtener_pistas(datos["juego_id"], 2))["pistas"]
+        self.assertEqual([p["palabra"] for p in pistas], datos["palabras"][1:3])
+        self.assertIsNotNone(pistas[0]["posiciones"])
+
+        # Un juego cuyo tablero ya no existe responde con error en vez de fallar
+        huerfano = game_logic.storage.crear_juego(10 ** 9)
+        self.assertEqual(json.loads(obtener_pistas(huerfano))["error"], "Tablero no encontrado")
+
+    # ------------------------------------------------------------
+    def test_progreso_ignora_palabra_vacia(self):
+        datos = json.loads(crear_juego())
+        progreso = json.loads(actualizar_progreso(datos["juego_id"], ""))
+        self.assertEqual(progreso["palabras_encontradas"], [])
+
     # ------------------------------------------------------------
     def test_crear_juego_json(self):
         datos = json.loads(crear_juego())
@@ -225,6 +655,310 @@ class TestIntegracion(unittest.TestCase):
         soluciones = datos_resolver["soluciones"]
         self.assertEqual(len(soluciones), len(palabras))
 
+    # ------------------------------------------------------------
+    def test_juego_por_categoria_y_cantidad(self):
+        datos_juego = json.loads(crear_juego(categoria="FRUTAS", cantidad=6))
+        self.assertEqual(datos_juego["categoria"], "FRUTAS")
+        self.assertEqual(datos_juego["total_palabras"], 6)
+        for palabra in datos_juego["palabras"]:
+            self.assertIsNotNone(encontrar_palabra_en_tablero(datos_juego["tablero"], palabra))
+
+        self.assertIn("error", json.loads(crear_juego(categoria="NO_EXISTE")))
+        self.assertIn("error", json.loads(crear_juego(categoria="PROFESIONES", cantidad=20)))
+        self.assertIn("error", json.loads(crear_juego(cantidad=0)))
+
+
+# ================================================================
+# TESTS: SALAS MULTIJUGADOR
+# ================================================================
+class TestSalas(unittest.TestCase):
+
+    def tearDown(self):
+        ws_server.salas_activas.clear()
+
+    # ------------------------------------------------------------
+    def test_jugadores_comparten_juego_y_sala_se_cierra(self):
+        sesion_a = ws_server.Sesion(object())
+        sesion_b = ws_server.Sesion(object())
+
+        sala, paquete = asyncio.run(ws_server.unir_a_sala(sesion_a, "amigos"))
+        palabra = json.loads(paquete)["palabras"][0]
+        sala.encontradas.add(palabra)  # Como si notificar_sala ya la hubiera difundido
+        mismo, paquete_tardio = asyncio.run(ws_server.unir_a_sala(sesion_b, "amigos"))
+
+        self.assertIs(sala, mismo)
+        self.assertEqual(sesion_a.juego_id, sesion_b.juego_id)
+        self.assertEqual(json.loads(paquete)["sala"], "amigos")
+        self.assertEqual(json.loads(paquete)["palabras_encontradas"], [])
+        # Quien se une tarde recibe las palabras que la sala ya encontró
+        self.assertEqual(json.loads(paquete_tardio)["palabras_encontradas"], [palabra])
+        self.assertEqual(len(sala.miembros), 2)
+
+        ws_server.salir_de_sala(sesion_a)
+        self.assertIn("amigos", ws_server.salas_activas)
+        ws_server.salir_de_sala(sesion_b)
+        self.assertNotIn("amigos", ws_server.salas_activas)
+        self.assertIsNone(sesion_b.juego_id)
+
+    # ------------------------------------------------------------
+    def test_uniones_concurrentes_crean_una_sola_sala(self):
+        sesiones = [ws_server.Sesion(object()) for _ in range(5)]
+
+        async def unir_todas():
+            return await asyncio.gather(*(ws_server.unir_a_sala(s, "concurrida") for s in sesiones))
+
+        resultados = asyncio.run(unir_todas())
+
+        sala = ws_server.salas_activas["concurrida"]
+        self.assertTrue(all(s is sala for s, _ in resultados))
+        self.assertEqual(len(sala.miembros), 5)
+        self.assertEqual({s.juego_id for s in sesiones}, {sala.juego_id})
+        self.assertEqual(ws_server.salas_creandose, {})
+
+    # ------------------------------------------------------------
+    def test_unirse_rechazado_con_varios_workers(self):
+        sesion = ws_server.Sesion(object())
+        ws_server.salas_habilitadas = False
+        try:
+            respuesta = json.loads(asyncio.run(ws_server.procesar_comando(
+                sesion, "UNIRSE", {"sala": "amigos"})))
+        finally:
+            ws_server.salas_habilitadas = True
+
+        self.assertIn("error", respuesta)
+        self.assertNotIn("amigos", ws_server.salas_activas)
+
+
+# ================================================================
+# TESTS: APAGADO ORDENADO
+# ================================================================
+class TestApagado(unittest.TestCase):
+
+    def tearDown(self):
+        ws_server.apagando = False
+
+    # ------------------------------------------------------------
+    def test_responde_en_curso_y_cierra_con_1001(self):
+        ws_server.logica()
+
+        async def escenario(checkpoint, snapshot):
+            servidor = await websockets.serve(ws_server.handler, "localhost", 0)
+            puerto = servidor.sockets[0].getsockname()[1]
+            ocioso = await websockets.connect(f"ws://localhost:{puerto}")
+            ocupado = await websockets.connect(f"ws://localhost:{puerto}")
+            await ocupado.send(json.dumps({"comando": "START", "cantidad": 5}))
+            await asyncio.sleep(0.01)
+
+            resumen = await ws_server.apagar_servidor(servidor, checkpoint, snapshot, plazo=5.0)
+            respuesta = json.loads(await ocupado.recv())
+            with self.assertRaises(websockets.exceptions.ConnectionClosed):
+                await ocupado.recv()
+            await ocioso.wait_closed()
+            return resumen, respuesta, ocioso.close_code, ocupado.close_code
+
+        with tempfile.TemporaryDirectory() as directorio:
+            checkpoint = os.path.join(directorio, "checkpoint.jsonl")
+            snapshot = os.path.join(directorio, "snapshot.pkl")
+            resumen, respuesta, codigo_ocioso, codigo_ocupado = asyncio.run(escenario(checkpoint, snapshot))
+            self.assertTrue(os.path.exists(checkpoint))
+
+            # El snapshot se escribe tras el drenaje: incluye el tablero del comando en curso
+            restaurado = DataStorage()
+            self.assertTrue(restaurado.cargar_snapshot(snapshot))
+            self.assertIsNotNone(restaurado.obtener_tablero(respuesta["tablero_id"]))
+
+        self.assertEqual(respuesta["total_palabras"], 5)
+        self.assertEqual((codigo_ocioso, codigo_ocupado), (1001, 1001))
+        self.assertEqual(resumen["conexiones_forzadas"], 0)
+        self.assertLess(resumen["total_ms"], 5000)
+        self.assertAlmostEqual(resumen["drenaje_ms"] + resumen["checkpoint_ms"], resumen["total_ms"], delta=0.2)
+
+
+# ================================================================
+# TESTS: COMPRESION
+# ================================================================
+class TestCompresion(unittest.TestCase):
+
+    # ------------------------------------------------------------
+    def test_umbral_y_metricas_por_comando(self):
+        metricas = MetricasCompresion()
+        servidor = DeflateConUmbral(False, False, 12, 12, {"memLevel": 5, "level": 1},
+                                    umbral=256, metricas=metricas)
+        cliente = PerMessageDeflate(False, False, 12, 12)
+
+        corto = Frame(Opcode.TEXT, b'{"mensaje": "Progreso guardado"}')
+        self.assertIs(servidor.encode(corto), corto)
+
+        paquete = json.dumps({"tablero": [["A"] * BOARD_SIZE] * BOARD_SIZE}).encode()
+        etiqueta = comando_actual.set("START")
+        try:
+            comprimido = servidor.encode(Frame(Opcode.TEXT, paquete))
+        finally:
+            comando_actual.reset(etiqueta)
+
+        self.assertTrue(comprimido.rsv1)
+        self.assertLess(len(comprimido.data), len(paquete) // 4)
+        self.assertEqual(bytes(cliente.decode(comprimido).data), paquete)
+
+        resumen = metricas.resumen()
+        self.assertEqual(resumen["OTRO"]["comprimidos"], 0)
+        self.assertEqual(resumen["START"]["bytes_originales"], len(paquete))
+        self.assertEqual(resumen["START"]["bytes_enviados"], len(comprimido.data))
+
+    # ------------------------------------------------------------
+    def test_extensiones_desde_configuracion(self):
+        self.assertIsNone(crear_extensiones({"activa": False}))
+        fabrica, = crear_extensiones({"umbral": 128, "ventana_servidor": 11, "nivel": 1})
+        self.assertEqual(fabrica.umbral, 128)
+        self.assertEqual(fabrica.server_max_window_bits, 11)
+
+
+# ================================================================
+# TESTS: PROTOCOLO EN LOTE
+# ================================================================
+class TestProtocoloLote(unittest.TestCase):
+
+    # ------------------------------------------------------------
+    def test_agregar_id(self):
+        self.assertEqual(json.loads(ws_server.agregar_id('{"a": 1}', 7)), {"id": 7, "a": 1})
+        self.assertEqual(json.loads(ws_server.agregar_id("{}", "x")), {"id": "x"})
+        self.assertEqual(ws_server.agregar_id('{"a": 1}', None), '{"a": 1}')
+        self.assertEqual(json.loads(ws_server.agregar_id('[1, 2]', 8)), {"id": 8, "respuesta": [1, 2]})
+        self.assertEqual(json.loads(ws_server.agregar_id('"ok"', 9)), {"id": 9, "respuesta": "ok"})
+
+    # ------------------------------------------------------------
+    def test_lote_encontrar_una_pasada(self):
+        sesion = ws_server.Sesion(object())
+        juego = json.loads(asyncio.run(ws_server.procesar_mensaje(
+            sesion, {"comando": "START", "id": 1})))
+        palabras = juego["palabras"][:3]
+
+        lote = [{"comando": "ENCONTRAR", "palabra": p, "id": i} for i, p in enumerate(palabras, 2)]
+        lote.append({"comando": "ESTADO", "id": "estado"})
+        respuestas = json.loads(asyncio.run(ws_server.procesar_lote(sesion, lote)))
+
+        # Una sola respuesta compartida para los tres ENCONTRAR
+        self.assertEqual(len(respuestas), 2)
+        self.assertEqual(respuestas[0]["ids"], [2, 3, 4])
+        self.assertEqual(respuestas[0]["total_encontradas"], 3)
+        self.assertEqual(respuestas[1]["id"], "estado")
+        self.assertEqual(respuestas[1]["progreso"], 3)
+
+    # ------------------------------------------------------------
+    def test_lote_consume_limite_por_comando(self):
+        sesion = ws_server.Sesion(object())
+        sesion.limitador = LimitadorSesion((3, 0.0), {})
+        lote = [{"comando": "ESTADO", "id": i} for i in range(5)]
+        respuestas = json.loads(asyncio.run(ws_server.procesar_lote(sesion, lote)))
+
+        self.assertEqual([r["id"] for r in respuestas], [0, 1, 2, 3, 4])
+        rechazos = [r for r in respuestas if r.get("error") == "Límite de solicitudes excedido"]
+        self.assertEqual([r["id"] for r in rechazos], [3, 4])
+        self.assertEqual(rechazos[0]["comando"], "*")
+
+        # Fuera de un lote el rechazo por sesión también conserva el id
+        rechazo = json.loads(asyncio.run(ws_server.procesar_mensaje(sesion, {"comando": "ESTADO", "id": 9})))
+        self.assertEqual((rechazo["id"], rechazo["comando"]), (9, "*"))
+
+
+    # ------------------------------------------------------------
+    def test_ids_invalidos_responden_error(self):
+        sesion = ws_server.Sesion(object())
+        for juego_id in ([1], {"a": 1}, "abc", None):
+            respuesta = json.loads(asyncio.run(ws_server.procesar_mensaje(
+                sesion, {"comando": "RETOMAR", "juego_id": juego_id, "id": 1})))
+            self.assertEqual(respuesta["id"], 1)
+            self.assertIn("error", respuesta)
+
+        juego = json.loads(asyncio.run(ws_server.procesar_mensaje(sesion, {"comando": "START", "cantidad": 3})))
+        retomado = json.loads(asyncio.run(ws_server.procesar_mensaje(
+            ws_server.Sesion(object()), {"comando": "RETOMAR", "juego_id": str(juego["juego_id"])})))
+        self.assertNotIn("error", retomado)
+
+        for tablero_id in ([1], {"a": 1}, "abc"):
+            respuesta = json.loads(asyncio.run(ws_server.procesar_mensaje(
+                sesion, {"comando": "LIDERES", "tablero_id": tablero_id})))
+            self.assertIn("error", respuesta)
+        lideres = json.loads(asyncio.run(ws_server.procesar_mensaje(
+            sesion, {"comando": "LIDERES", "tablero_id": str(juego["tablero_id"])})))
+        self.assertEqual(lideres["tablero_id"], juego["tablero_id"])
+
+
+# ================================================================
+# TESTS: LIMITADOR DE SOLICITUDES
+# ================================================================
+class RelojFalso:
+    def __init__(self):
+        self.ahora = 0.0
+
+    def __call__(self):
+        return self.ahora
+
+
+class TestLimitador(unittest.TestCase):
+
+    # ------------------------------------------------------------
+    def test_cubo_rafaga_y_reposicion(self):
+        reloj = RelojFalso()
+        cubo = CuboTokens(2, 1.0, reloj=reloj)
+        self.assertTrue(cubo.consumir())
+        self.assertTrue(cubo.consumir())
+        self.assertFalse(cubo.consumir())
+        self.assertAlmostEqual(cubo.espera(), 1.0)
+        reloj.ahora = 1.0
+        self.assertTrue(cubo.consumir())
+
+    # ------------------------------------------------------------
+    def test_limite_por_comando(self):
+        reloj = RelojFalso()
+        limitador = LimitadorSesion((100, 10.0), {"START": (1, 0.5)}, reloj=reloj)
+        self.assertTrue(limitador.permitir_comando("START"))
+        self.assertFalse(limitador.permitir_comando("START"))
+        self.assertTrue(limitador.permitir_comando("ESTADO"))
+        self.assertAlmostEqual(limitador.espera("START"), 2.0)
+
+
+# ================================================================
+# TESTS: CLIENTE / PRUEBA DE CARGA
+# ================================================================
+class TestMetricasCliente(unittest.TestCase):
+
+    # ------------------------------------------------------------
+    def test_resumen_percentiles_y_errores(self):
+        metricas = MetricasComandos()
+        for ms in range(1, 101):
+            metricas.registrar("START", ms / 1000)
+        metricas.registrar("ENCONTRAR", 0.002, error=True)
+        metricas.registrar_error("RESOLVER")
+
+        resumen = metricas.resumen()
+        self.assertEqual(resumen["START"]["total"], 100)
+        self.assertAlmostEqual(resumen["START"]["p50_ms"], 50.0)
+        self.assertAlmostEqual(resumen["START"]["p99_ms"], 99.0)
+        self.assertAlmostEqual(resumen["START"]["max_ms"], 100.0)
+        self.assertEqual(resumen["ENCONTRAR"]["errores"], 1)
+        self.assertEqual(resumen["RESOLVER"]["total"], 0)
+        self.assertEqual(resumen["RESOLVER"]["errores"], 1)
+
+    # ------------------------------------------------------------
+    def test_rechazos_por_limite_aparte_de_errores(self):
+        async def escenario():
+            servidor = await websockets.serve(ws_server.handler, "localhost", 0)
+            puerto = servidor.sockets[0].getsockname()[1]
+            metricas = MetricasComandos()
+            try:
+                async with ClienteSopa(f"ws://localhost:{puerto}", metricas) as cliente:
+                    for _ in range(RATE_LIMITS_COMANDO["START"][0] + 1):
+                        await cliente.start(cantidad=3)
+            finally:
+                servidor.close()
+                await servidor.wait_closed()
+            return metricas.resumen()["START"]
+
+        ws_server.logica()
+        start = asyncio.run(escenario())
+        self.assertEqual((start["errores"], start["rechazos"]), (0, 1))
+
 
 # ================================================================
 # RUNNER
@@ -234,8 +968,17 @@ def run_all_tests():
     suite = unittest.TestSuite()
     suite.addTests(loader.loadTestsFromTestCase(TestBoardGenerator))
     suite.addTests(loader.loadTestsFromTestCase(TestDataStorage))
+    suite.addTests(loader.loadTestsFromTestCase(TestDataStorageConcurrente))
+    suite.addTests(loader.loadTestsFromTestCase(TestSQLiteStorage))
+    suite.addTests(loader.loadTestsFromTestCase(TestAsyncStorage))
     suite.addTests(loader.loadTestsFromTestCase(TestGameLogic))
     suite.addTests(loader.loadTestsFromTestCase(TestIntegracion))
+    suite.addTests(loader.loadTestsFromTestCase(TestSalas))
+    suite.addTests(loader.loadTestsFromTestCase(TestApagado))
+    suite.addTests(loader.loadTestsFromTestCase(TestCompresion))
+    suite.addTests(loader.loadTestsFromTestCase(TestProtocoloLote))
+    suite.addTests(loader.loadTestsFromTestCase(TestLimitador))
+    suite.addTests(loader.loadTestsFromTestCase(TestMetricasCliente))
 
     runner = unittest.TextTestRunner(verbosity=2)
     return runner.run(suite).wasSuccessful()
@@ -1,23 +1,291 @@
 import asyncio
+import json
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional
+
 import websockets
 
 HOST = "localhost"
 PORT = 5000
+ERROR_LIMITE = "Límite de solicitudes excedido"  # Rechazo del rate limiting del servidor
+
+
+def es_rechazo_por_limite(respuesta) -> bool:
+    """Indica si la respuesta es un rechazo por límite de solicitudes"""
+    return isinstance(respuesta, dict) and respuesta.get("error") == ERROR_LIMITE
+
+
+class MetricasComandos:
+    """Acumula latencias, errores y rechazos por límite por comando"""
+    def __init__(self):
+        self.latencias: Dict[str, List[float]] = {}
+        self.errores: Dict[str, int] = {}
+        self.rechazos: Dict[str, int] = {}
+
+    def registrar(self, comando: str, segundos: float, error: bool = False, rechazado: bool = False):
+        """Registra una llamada a un comando (un rechazo por límite no cuenta como error)"""
+        self.latencias.setdefault(comando, []).append(segundos)
+        if error:
+            self.errores[comando] = self.errores.get(comando, 0) + 1
+        if rechazado:
+            self.rechazos[comando] = self.rechazos.get(comando, 0) + 1
+
+    def registrar_error(self, comando: str):
+        """Registra un error sin latencia (p. ej. conexión perdida)"""
+        self.latencias.setdefault(comando, [])
+        self.errores[comando] = self.errores.get(comando, 0) + 1
+
+    def resumen(self) -> Dict[str, dict]:
+        """Retorna conteo, errores y percentiles (ms) por comando"""
+        resultado = {}
+        for comando, latencias in self.latencias.items():
+            ordenadas = sorted(latencias)
+            resultado[comando] = {
+                "total": len(ordenadas),
+                "errores": self.errores.get(comando, 0),
+                "rechazos": self.rechazos.get(comando, 0),
+                "p50_ms": _percentil(ordenadas, 50) * 1000,
+                "p95_ms": _percentil(ordenadas, 95) * 1000,
+                "p99_ms": _percentil(ordenadas, 99) * 1000,
+                "max_ms": (ordenadas[-1] if ordenadas else 0.0) * 1000
+            }
+        return resultado
+
+
+def _percentil(ordenadas: List[float], p: float) -> float:
+    """Percentil por rango más cercano sobre una lista ya ordenada"""
+    if not ordenadas:
+        return 0.0
+    indice = max(0, min(len(ordenadas) - 1, round(p / 100 * len(ordenadas)) - 1))
+    return ordenadas[indice]
+
+
+class ClienteSopa:
+    """
+    Cliente WebSocket para el servidor de sopa de letras. Con `reintentos_limite`
+    un comando rechazado por límite se reenvía tras esperar `reintentar_en`.
+    """
+    def __init__(self, uri: str = f"ws://{HOST}:{PORT}", metricas: Optional[MetricasComandos] = None,
+                 reintentos_limite: int = 0):
+        self.uri = uri
+        self.metricas = metricas
+        self.reintentos_limite = reintentos_limite
+        self.websocket = None
+        self.juego = None
+        self.eventos = deque()  # Eventos difundidos por la sala (no son respuestas)
+        self._next_id = 1
+
+    async def conectar(self):
+        """Abre la conexión con el servidor"""
+        self.websocket = await websockets.connect(self.uri)
+        return self
+
+    async def cerrar(self):
+        """Cierra la conexión si está abierta"""
+        if self.websocket is not None:
+            await self.websocket.close()
+            self.websocket = None
+
+    async def __aenter__(self):
+        return await self.conectar()
+
+    async def __aexit__(self, *exc):
+        await self.cerrar()
+
+    async def enviar_comando(self, comando: str, **parametros) -> dict:
+        """Envía un comando JSON y espera su respuesta"""
+        mensaje = {"comando": comando}
+        mensaje.update(parametros)
+
+        for intento in range(self.reintentos_limite + 1):
+            inicio = time.perf_counter()
+            try:
+                await self.websocket.send(json.dumps(mensaje))
+                respuesta = await self.recibir_respuesta()
+            except Exception:
+                if self.metricas is not None:
+                    self.metricas.registrar_error(comando)
+                raise
+
+            rechazado = es_rechazo_por_limite(respuesta)
+            if self.metricas is not None:
+                self.metricas.registrar(comando, time.perf_counter() - inicio,
+                                        "error" in respuesta and not rechazado, rechazado)
+            if not rechazado or intento == self.reintentos_limite:
+                return respuesta
+            await asyncio.sleep(respuesta.get("reintentar_en", 0))
+
+    async def enviar_lote(self, comandos: List[dict]) -> List[dict]:
+        """Envía varios comandos en un solo mensaje; las respuestas vuelven en el mismo orden"""
+        lote = []
+        for comando in comandos:
+            lote.append({"id": self._next_id, **comando})
+            self._next_id += 1
+
+        inicio = time.perf_counter()
+        try:
+            await self.websocket.send(json.dumps(lote))
+            respuesta = await self.recibir_respuesta()
+        except Exception:
+            if self.metricas is not None:
+                self.metricas.registrar_error("LOTE")
+            raise
+
+        if isinstance(respuesta, dict):
+            # Error a nivel de mensaje (p. ej. lote demasiado grande)
+            respuestas = [respuesta] * len(lote)
+        else:
+            # Los ENCONTRAR agrupados comparten una respuesta con la lista "ids"
+            por_id = {i: r for r in respuesta for i in r.get("ids", [r.get("id")])}
+            respuestas = [por_id.get(c["id"], {"error": "Sin respuesta"}) for c in lote]
+
+        if self.metricas is not None:
+            rechazos = [es_rechazo_por_limite(r) for r in respuestas]
+            self.metricas.registrar("LOTE", time.perf_counter() - inicio,
+                                    any("error" in r and not rechazo for r, rechazo in zip(respuestas, rechazos)),
+                                    any(rechazos))
+        return respuestas
+
+    async def recibir_respuesta(self):
+        """Recibe la siguiente respuesta, apartando los eventos de sala"""
+        while True:
+            datos = json.loads(await self.websocket.recv())
+            if not isinstance(datos, dict) or "evento" not in datos:
+                return datos
+            self.eventos.append(datos)
+
+    async def recibir_evento(self) -> dict:
+        """Espera el siguiente evento difundido por la sala"""
+        if self.eventos:
+            return self.eventos.popleft()
+        while True:
+            datos = json.loads(await self.websocket.recv())
+            if isinstance(datos, dict) and "evento" in datos:
+                return datos
+
+    async def start(self, **parametros) -> dict:
+        """Inicia un juego nuevo y lo guarda como actual (p. ej. categoria="ANIMALES", cantidad=8)"""
+        self.juego = await self.enviar_comando("START", **parametros)
+        return self.juego
+
+    async def encontrar(self, palabra: str) -> dict:
+        """Reporta una palabra encontrada"""
+        return await self.enviar_comando("ENCONTRAR", palabra=palabra)
+
+    async def encontrar_varias(self, palabras: List[str]) -> List[dict]:
+        """Reporta varias palabras en un solo mensaje"""
+        return await self.enviar_lote([{"comando": "ENCONTRAR", "palabra": p} for p in palabras])
+
+    async def resolver(self) -> dict:
+        """Solicita la solución del juego actual"""
+        return await self.enviar_comando("RESOLVER")
+
+    async def resolver_stream(self):
+        """Pide la solución en streaming; produce cada mensaje hasta el de tipo FIN"""
+        inicio = time.perf_counter()
+        await self.websocket.send(json.dumps({"comando": "RESOLVER", "stream": True}))
+        while True:
+            mensaje = await self.recibir_respuesta()
+            yield mensaje
+            if mensaje.get("tipo") != "SOLUCION":
+                break
+        if self.metricas is not None:
+            self.metricas.registrar("RESOLVER_STREAM", time.perf_counter() - inicio, "error" in mensaje)
+
+    async def pista(self, cantidad: int = 1) -> dict:
+        """Pide la posición de las primeras palabras aún no encontradas"""
+        return await self.enviar_comando("PISTA", cantidad=cantidad)
+
+    async def unirse(self, sala: str) -> dict:
+        """Se une a una sala multijugador y recibe su juego compartido"""
+        self.juego = await self.enviar_comando("UNIRSE", sala=sala)
+        return self.juego
+
+    async def salir(self) -> dict:
+        """Abandona la sala actual"""
+        return await self.enviar_comando("SALIR")
+
+    async def estado(self) -> dict:
+        """Consulta el estado del juego actual"""
+        return await self.enviar_comando("ESTADO")
+
+    async def lideres(self, **filtros) -> dict:
+        """Consulta los mejores tiempos (tablero_id=..., categoria=... o actual=True)"""
+        return await self.enviar_comando("LIDERES", **filtros)
+
+    async def estadisticas(self) -> dict:
+        """Consulta las estadísticas del servidor"""
+        return await self.enviar_comando("ESTADISTICAS")
+
+
+class PoolConexiones:
+    """
+    Pool con un máximo de conexiones simultáneas. Con `reutilizar=False` cada
+    préstamo abre una conexión (una sesión del servidor) nueva y la cierra al final.
+    """
+    def __init__(self, uri: str, tamano: int, metricas: Optional[MetricasComandos] = None,
+                 reutilizar: bool = True, reintentos_limite: int = 0):
+        self.uri = uri
+        self.tamano = tamano
+        self.metricas = metricas
+        self.reutilizar = reutilizar
+        self.reintentos_limite = reintentos_limite
+        self._libres: asyncio.Queue = asyncio.Queue()
+        self._semaforo = asyncio.Semaphore(tamano)
+        self._todas: List[ClienteSopa] = []
+
+    @asynccontextmanager
+    async def cliente(self):
+        """Presta un cliente conectado; lo devuelve al pool al terminar"""
+        async with self._semaforo:
+            if self._libres.empty():
+                cliente = ClienteSopa(self.uri, self.metricas, self.reintentos_limite)
+                inicio = time.perf_counter()
+                try:
+                    await cliente.conectar()
+                except Exception:
+                    if self.metricas is not None:
+                        self.metricas.registrar_error("CONECTAR")
+                    raise
+                if self.metricas is not None:
+                    self.metricas.registrar("CONECTAR", time.perf_counter() - inicio)
+                self._todas.append(cliente)
+            else:
+                cliente = self._libres.get_nowait()
+
+            sana = False
+            try:
+                yield cliente
+                sana = True
+            finally:
+                if sana and self.reutilizar:
+                    self._libres.put_nowait(cliente)
+                else:
+                    self._todas.remove(cliente)
+                    await cliente.cerrar()
+
+    async def cerrar(self):
+        """Cierra todas las conexiones del pool"""
+        await asyncio.gather(*(c.cerrar() for c in self._todas), return_exceptions=True)
+        self._todas.clear()
+
 
 async def main():
     uri = f"ws://{HOST}:{PORT}"
 
     print("Intentando conectar al servidor WebSocket...")
 
-    async with websockets.connect(uri) as websocket:
+    async with ClienteSopa(uri) as cliente:
         print("✔ Conectado al servidor")
 
-        await websocket.send("START")
-        paquete = await websocket.recv()
+        paquete = await cliente.start()
         print("Juego recibido:", paquete)
 
-        await websocket.send("RESOLVER")
-        respuesta = await websocket.recv()
+        respuesta = await cliente.resolver()
         print("Solución:", respuesta)
 
-asyncio.run(main())
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,14 +1,66 @@
+import time
+_INICIO_PROCESO = time.perf_counter()
+
 import asyncio
+import os
+import signal
 import websockets
 import json
-from game_logic import crear_juego, resolver_juego, actualizar_progreso, obtener_estado_juego, obtener_estadisticas
-from data_storage import storage
+from config import (MAX_MESSAGE_SIZE, MAX_PENDING_MESSAGES, IDLE_TIMEOUT, MAX_COMANDOS_LOTE,
+                    SNAPSHOT_ARCHIVO, SNAPSHOT_TABLEROS_RECIENTES, TABLEROS_EN_MEMORIA,
+                    TOP_LIDERES, CHECKPOINT_ARCHIVO, INTERVALO_CHECKPOINT, PLAZO_APAGADO,
+                    PLAZO_GUARDADO, COMPRESION)
+from compresion import MetricasCompresion, comando_actual, crear_extensiones
+from limitador import LimitadorSesion
 
 HOST = "localhost"
 PORT = 5000
 
 
 sesiones_activas = []
+salas_activas = {}
+salas_creandose = {}  # nombre -> Future que se resuelve cuando la sala existe (o falla)
+# Las salas viven en la memoria del proceso: con varios workers dos jugadores de la
+# misma sala podrían caer en procesos distintos, así que ahí UNIRSE se rechaza
+salas_habilitadas = True
+
+_game_logic = None
+restauracion_lista = None  # asyncio.Event creado por main()
+apagando = False           # Activado por apagar_servidor: no se atienden comandos nuevos
+
+CODIGO_APAGADO = 1001      # "Going away"
+MOTIVO_APAGADO = "Servidor apagándose"
+
+def logica():
+    """Importa game_logic (storage y generador de tableros) la primera vez que se usa"""
+    global _game_logic
+    if _game_logic is None:
+        import game_logic
+        _game_logic = game_logic
+    return _game_logic
+
+metricas_compresion = MetricasCompresion()
+
+estadisticas_servidor = {
+    "rechazos_rate_limit": 0,
+    "rechazos_por_comando": {},
+    "mensajes_demasiado_grandes": 0,
+    "desconexiones_inactividad": 0,
+    "arranque": {
+        "escucha_ms": None,
+        "primer_accept_ms": None,
+        "restauracion_ms": None
+    },
+    "apagado": {
+        "total_ms": None,
+        "drenaje_ms": None,
+        "checkpoint_ms": None,
+        "comandos_drenados": 0,
+        "conexiones_forzadas": 0,
+        "registros_checkpoint": 0,
+        "guardado_vencido": False
+    }
+}
 
 class Sesion:
     """Representa una sesión de cliente conectado"""
@@ -17,14 +69,109 @@ class Sesion:
         self.cliente_id = id(websocket)
         self.juego_id = None
         self.tablero_id = None
+        self.sala = None
+        self.limitador = LimitadorSesion()
+        self.en_curso = False  # True mientras se procesa un mensaje (el apagado lo espera)
     
     def to_dict(self):
         return {
             "cliente_id": self.cliente_id,
             "juego_id": self.juego_id,
-            "tablero_id": self.tablero_id
+            "tablero_id": self.tablero_id,
+            "sala": self.sala.nombre if self.sala else None
+        }
+
+class Sala:
+    """Representa una sala donde varios jugadores comparten un mismo juego"""
+    def __init__(self, nombre, paquete):
+        datos_juego = json.loads(paquete)
+        datos_juego["sala"] = nombre
+        self.nombre = nombre
+        self.datos_juego = datos_juego  # Base del paquete que recibe cada jugador al unirse
+        self.juego_id = datos_juego.get("juego_id")
+        self.tablero_id = datos_juego.get("tablero_id")
+        self.palabras = set(datos_juego.get("palabras", []))
+        self.encontradas = set()
+        self.miembros = set()
+    
+    def paquete(self):
+        """Paquete de unión con el estado actual: quien llega tarde ve lo ya encontrado"""
+        return json.dumps({
+            **self.datos_juego,
+            "palabras_encontradas": sorted(self.encontradas),
+            "total_encontradas": len(self.encontradas)
+        })
+    
+    def difundir(self, evento):
+        """Codifica el evento una sola vez y lo envía a todos los miembros"""
+        mensaje = json.dumps(evento).encode("utf-8")
+        # Los bytes del evento no se cuentan como respuesta al comando que lo originó
+        etiqueta = comando_actual.set("EVENTO")
+        try:
+            websockets.broadcast(self.miembros, mensaje, text=True)
+        finally:
+            comando_actual.reset(etiqueta)
+    
+    def to_dict(self):
+        return {
+            "sala": self.nombre,
+            "juego_id": self.juego_id,
+            "tablero_id": self.tablero_id,
+            "jugadores": len(self.miembros),
+            "encontradas": sorted(self.encontradas)
         }
 
+async def unir_a_sala(sesion, nombre):
+    """Une la sesión a una sala, creándola con un juego nuevo si no existe"""
+    salir_de_sala(sesion)
+    
+    while True:
+        sala = salas_activas.get(nombre)
+        if sala is not None:
+            break
+        pendiente = salas_creandose.get(nombre)
+        if pendiente is not None:
+            # Otro jugador ya la está creando: se espera a esa misma sala
+            error = await asyncio.shield(pendiente)
+            if error is not None:
+                return None, error
+            continue
+        
+        # El nombre se reserva antes del await para que nadie cree una segunda sala
+        pendiente = salas_creandose[nombre] = asyncio.get_running_loop().create_future()
+        error = None
+        try:
+            paquete = await logica().crear_juego_async()
+            if "error" in json.loads(paquete):
+                error = paquete
+                return None, paquete
+            sala = Sala(nombre, paquete)
+            salas_activas[nombre] = sala
+            print(f"🏠 Sala creada: {nombre} (Juego #{sala.juego_id})")
+            break
+        finally:
+            del salas_creandose[nombre]
+            pendiente.set_result(error)
+    
+    sala.miembros.add(sesion.websocket)
+    sesion.sala = sala
+    sesion.juego_id = sala.juego_id
+    sesion.tablero_id = sala.tablero_id
+    return sala, sala.paquete()
+
+def salir_de_sala(sesion):
+    """Saca a la sesión de su sala y elimina la sala si queda vacía"""
+    sala = sesion.sala
+    if sala is None:
+        return
+    sala.miembros.discard(sesion.websocket)
+    sesion.sala = None
+    sesion.juego_id = None
+    sesion.tablero_id = None
+    if not sala.miembros:
+        salas_activas.pop(sala.nombre, None)
+        print(f"🏚 Sala cerrada: {sala.nombre}")
+
 def buscar_sesion(websocket):
     """Busca una sesión en el ArrayList"""
     cliente_id = id(websocket)
@@ -43,91 +190,359 @@ def eliminar_sesion(websocket):
     """Elimina una sesión del ArrayList"""
     sesion = buscar_sesion(websocket)
     if sesion:
+        salir_de_sala(sesion)
         sesiones_activas.remove(sesion)
 
+def rechazo_por_limite(sesion, comando):
+    """Cuenta el rechazo y arma la respuesta indicando cuándo reintentar"""
+    estadisticas_servidor["rechazos_rate_limit"] += 1
+    por_comando = estadisticas_servidor["rechazos_por_comando"]
+    por_comando[comando] = por_comando.get(comando, 0) + 1
+    
+    return json.dumps({
+        "error": "Límite de solicitudes excedido",
+        "comando": comando,
+        "reintentar_en": round(sesion.limitador.espera(comando), 2)
+    })
+
+def verificar_limites(sesion, comando):
+    """Cobra un token de la sesión y, si tiene, uno del comando; retorna el rechazo o None"""
+    if not sesion.limitador.permitir_mensaje():
+        return rechazo_por_limite(sesion, "*")
+    if not sesion.limitador.permitir_comando(comando):
+        return rechazo_por_limite(sesion, comando)
+    return None
+
+def agregar_id(respuesta, request_id):
+    """
+    Agrega el id de la solicitud a una respuesta JSON ya codificada; si la
+    respuesta no es un objeto se envuelve como {"id": ..., "respuesta": ...}.
+    """
+    if request_id is None:
+        return respuesta
+    datos = json.loads(respuesta)
+    if isinstance(datos, dict):
+        return json.dumps({"id": request_id, **datos})
+    return json.dumps({"id": request_id, "respuesta": datos})
+
+def notificar_sala(sesion, palabras):
+    """Difunde a la sala las palabras que nadie había encontrado aún"""
+    sala = sesion.sala
+    if not sala:
+        return
+    for palabra in palabras:
+        if palabra in sala.palabras and palabra not in sala.encontradas:
+            sala.encontradas.add(palabra)
+            sala.difundir({
+                "evento": "PALABRA_ENCONTRADA",
+                "sala": sala.nombre,
+                "palabra": palabra,
+                "cliente_id": sesion.cliente_id,
+                "total_encontradas": len(sala.encontradas),
+                "total_palabras": len(sala.palabras),
+                "completado": len(sala.encontradas) >= len(sala.palabras)
+            })
+
+async def registrar_palabras(sesion, palabras):
+    """Guarda varias palabras encontradas en una sola pasada por el storage"""
+    if not sesion.juego_id:
+        return json.dumps({
+            "error": "No hay juego activo"
+        })
+    
+    respuesta = await logica().actualizar_progreso_lote_async(sesion.juego_id, palabras)
+    datos_respuesta = json.loads(respuesta)
+    
+    palabras_encontradas = len(datos_respuesta.get('palabras_encontradas', []))
+    total = datos_respuesta.get('total_palabras', 0)
+    print(f"✓ Palabras encontradas: {', '.join(palabras)} ({palabras_encontradas}/{total})")
+    
+    if datos_respuesta.get('completado', False):
+        print(f"🎉 ¡Juego completado! (Cliente: {sesion.cliente_id})")
+    
+    notificar_sala(sesion, palabras)
+    return respuesta
+
+async def procesar_comando(sesion, comando, datos, enviar=None):
+    """
+    Ejecuta un comando y retorna la respuesta JSON codificada.
+    Si se pasa `enviar`, los comandos en streaming mandan sus mensajes por ahí y retornan None.
+    """
+    if comando == "START":
+       
+        salir_de_sala(sesion)
+        print(f"🎮 Nuevo juego iniciado (Cliente: {sesion.cliente_id})")
+        dificultad = datos.get("dificultad")
+        categoria = str(datos.get("categoria") or "PROFESIONES").upper()
+        cantidad = datos.get("cantidad")
+        try:
+            cantidad = int(cantidad) if cantidad is not None else None
+        except (TypeError, ValueError):
+            return json.dumps({
+                "error": "La cantidad de palabras debe ser un número"
+            })
+        paquete = await logica().crear_juego_async(str(dificultad).upper() if dificultad else None,
+                                                   categoria, cantidad)
+        datos_juego = json.loads(paquete)
+        
+        sesion.juego_id = datos_juego.get("juego_id")
+        sesion.tablero_id = datos_juego.get("tablero_id")
+        
+        print(f"   → Palabras: {datos_juego.get('total_palabras')}")
+        return paquete
+    
+    elif comando == "RESOLVER":
+        
+        if sesion.juego_id and sesion.tablero_id:
+            print(f"🔍 Solución solicitada (Cliente: {sesion.cliente_id})")
+            if datos.get("stream") and enviar is not None:
+                async for mensaje in logica().resolver_juego_stream(sesion.juego_id, sesion.tablero_id):
+                    await enviar(agregar_id(mensaje, datos.get("id")))
+                return None
+            
+            respuesta = await logica().resolver_juego_async(sesion.juego_id, sesion.tablero_id)
+            datos_respuesta = json.loads(respuesta)
+            
+            print(f"   → Soluciones enviadas: {len(datos_respuesta.get('soluciones', []))}")
+            return respuesta
+        return json.dumps({
+            "error": "No hay juego activo."
+        })
+    
+    elif comando == "ENCONTRAR":
+        return await registrar_palabras(sesion, [str(datos.get("palabra", "")).upper()])
+    
+    elif comando == "PISTA":
+        if not sesion.juego_id:
+            return json.dumps({
+                "error": "No hay juego activo"
+            })
+        try:
+            cantidad = int(datos.get("cantidad", 1))
+        except (TypeError, ValueError):
+            return json.dumps({
+                "error": "La cantidad de pistas debe ser un número"
+            })
+        return await logica().obtener_pistas_async(sesion.juego_id, cantidad)
+    
+    elif comando == "ESTADO":
+        if sesion.juego_id:
+            return await logica().obtener_estado_juego_async(sesion.juego_id)
+        return json.dumps({
+            "error": "No hay juego activo"
+        })
+    
+    elif comando == "UNIRSE":
+        if not salas_habilitadas:
+            return json.dumps({
+                "error": "Las salas no están disponibles con varios workers"
+            })
+        nombre = str(datos.get("sala", "")).strip()
+        if not nombre:
+            return json.dumps({
+                "error": "Falta el nombre de la sala"
+            })
+        sala, paquete = await unir_a_sala(sesion, nombre)
+        if sala:
+            print(f"👥 Cliente {sesion.cliente_id} en sala {nombre} ({len(sala.miembros)} jugadores)")
+        return paquete
+    
+    elif comando == "SALIR":
+        if sesion.sala:
+            nombre = sesion.sala.nombre
+            salir_de_sala(sesion)
+            return json.dumps({
+                "mensaje": f"Saliste de la sala {nombre}"
+            })
+        return json.dumps({
+            "error": "No estás en ninguna sala"
+        })
+    
+    elif comando == "RETOMAR":
+        try:
+            juego_id = int(datos.get("juego_id"))
+        except (TypeError, ValueError):
+            return json.dumps({
+                "error": "El id del juego debe ser un número"
+            })
+        salir_de_sala(sesion)
+        # Permite continuar en cualquier worker un juego creado en otro
+        juego = await logica().storage_async.obtener_juego(juego_id)
+        if juego:
+            sesion.juego_id = juego.id
+            sesion.tablero_id = juego.tablero_id
+            return await logica().obtener_estado_juego_async(juego.id)
+        return json.dumps({
+            "error": "Juego no encontrado"
+        })
+    
+    elif comando == "LIDERES":
+        try:
+            cantidad = max(0, min(int(datos.get("cantidad", TOP_LIDERES)), TOP_LIDERES))
+        except (TypeError, ValueError):
+            return json.dumps({
+                "error": "La cantidad de líderes debe ser un número"
+            })
+        tablero_id = datos.get("tablero_id")
+        if datos.get("actual"):
+            tablero_id = sesion.tablero_id
+        elif tablero_id is not None:
+            try:
+                tablero_id = int(tablero_id)
+            except (TypeError, ValueError):
+                return json.dumps({
+                    "error": "El id del tablero debe ser un número"
+                })
+        categoria = datos.get("categoria")
+        return await logica().obtener_lideres_async(tablero_id, str(categoria).upper() if categoria else None,
+                                                    cantidad)
+    
+    elif comando == "ESTADISTICAS":
+        datos_estadisticas = json.loads(await logica().obtener_estadisticas_async())
+        datos_estadisticas["servidor"] = {**estadisticas_servidor, "compresion": metricas_compresion.resumen()}
+        return json.dumps(datos_estadisticas)
+    
+    return json.dumps({
+        "error": f"Comando desconocido: {comando}"
+    })
+
+async def procesar_mensaje(sesion, datos, enviar=None):
+    """Valida límites de un comando individual (también dentro de un lote) y lo ejecuta"""
+    if not isinstance(datos, dict):
+        if not sesion.limitador.permitir_mensaje():
+            return rechazo_por_limite(sesion, "*")
+        return json.dumps({
+            "error": "Formato de mensaje inválido"
+        })
+    
+    comando = str(datos.get("comando", "")).upper()
+    rechazo = verificar_limites(sesion, comando)
+    if rechazo is not None:
+        return agregar_id(rechazo, datos.get("id"))
+    
+    respuesta = await procesar_comando(sesion, comando, datos, enviar)
+    if respuesta is None:
+        return None
+    return agregar_id(respuesta, datos.get("id"))
+
+async def procesar_lote(sesion, lote):
+    """
+    Ejecuta un arreglo de comandos y retorna un único arreglo JSON de respuestas.
+    Cada comando cuenta para el límite de la sesión. Los ENCONTRAR consecutivos se
+    agrupan en una sola actualización del storage y comparten una sola respuesta
+    con la lista de sus ids ("ids").
+    """
+    if not lote or len(lote) > MAX_COMANDOS_LOTE:
+        if not sesion.limitador.permitir_mensaje():
+            return rechazo_por_limite(sesion, "*")
+        if not lote:
+            return "[]"
+        return json.dumps({
+            "error": f"El lote excede {MAX_COMANDOS_LOTE} comandos"
+        })
+    
+    respuestas = []
+    i = 0
+    while i < len(lote):
+        datos = lote[i]
+        comando = str(datos.get("comando", "")).upper() if isinstance(datos, dict) else ""
+        
+        if comando != "ENCONTRAR":
+            respuestas.append(await procesar_mensaje(sesion, datos))
+            i += 1
+            continue
+        
+        grupo = []
+        while i < len(lote) and isinstance(lote[i], dict) and str(lote[i].get("comando", "")).upper() == "ENCONTRAR":
+            grupo.append(lote[i])
+            i += 1
+        
+        permitidos = []
+        for datos in grupo:
+            rechazo = verificar_limites(sesion, comando)
+            if rechazo is None:
+                permitidos.append(datos)
+            else:
+                respuestas.append(agregar_id(rechazo, datos.get("id")))
+        
+        if len(permitidos) == 1:
+            respuesta = await registrar_palabras(sesion, [str(permitidos[0].get("palabra", "")).upper()])
+            respuestas.append(agregar_id(respuesta, permitidos[0].get("id")))
+        elif permitidos:
+            respuesta = await registrar_palabras(sesion, [str(d.get("palabra", "")).upper() for d in permitidos])
+            respuestas.append(json.dumps({"ids": [d.get("id") for d in permitidos], **json.loads(respuesta)}))
+    
+    return "[" + ", ".join(respuestas) + "]"
+
+def etiqueta_comando(datos):
+    """Nombre con el que se contabilizan los bytes de la respuesta"""
+    if isinstance(datos, list):
+        return "LOTE"
+    if isinstance(datos, dict):
+        return str(datos.get("comando", "")).upper() or "?"
+    return "?"
+
 async def handler(websocket):
     """Maneja las conexiones WebSocket"""
+    arranque = estadisticas_servidor["arranque"]
+    if arranque["primer_accept_ms"] is None:
+        arranque["primer_accept_ms"] = round((time.perf_counter() - _INICIO_PROCESO) * 1000, 1)
+    
     sesion = agregar_sesion(websocket)
     print(f"✓ Cliente conectado (ID: {sesion.cliente_id})")
     print(f"  Total sesiones activas: {len(sesiones_activas)}")
     
     try:
-        async for message in websocket:
+        if restauracion_lista is not None and not restauracion_lista.is_set():
+            # La conexión ya está aceptada; los comandos esperan a que termine la restauración
+            await restauracion_lista.wait()
+        
+        while not apagando:
+            try:
+                message = await asyncio.wait_for(websocket.recv(), timeout=IDLE_TIMEOUT)
+            except asyncio.TimeoutError:
+                estadisticas_servidor["desconexiones_inactividad"] += 1
+                print(f"⌛ Cliente inactivo por {IDLE_TIMEOUT}s (ID: {sesion.cliente_id})")
+                await websocket.close(1000, "Inactividad")
+                break
+            
+            if apagando:
+                # Llegó después de iniciar el apagado: no cuenta como comando en curso
+                break
+            
+            sesion.en_curso = True
             try:
                
                 datos = json.loads(message)
-                comando = datos.get("comando", "").upper()
-                
-                if comando == "START":
-                   
-                    print(f"🎮 Nuevo juego iniciado (Cliente: {sesion.cliente_id})")
-                    paquete = crear_juego()
-                    datos_juego = json.loads(paquete)
-                    
-                    sesion.juego_id = datos_juego.get("juego_id")
-                    sesion.tablero_id = datos_juego.get("tablero_id")
-                    
-                    await websocket.send(paquete)
-                    print(f"   → Palabras: {datos_juego.get('total_palabras')}")
-                
-                elif comando == "RESOLVER":
-                    
-                    if sesion.juego_id and sesion.tablero_id:
-                        print(f"🔍 Solución solicitada (Cliente: {sesion.cliente_id})")
-                        respuesta = resolver_juego(sesion.juego_id, sesion.tablero_id)
-                        datos_respuesta = json.loads(respuesta)
-                        
-                        await websocket.send(respuesta)
-                        print(f"   → Soluciones enviadas: {len(datos_respuesta.get('soluciones', []))}")
-                    else:
-                        await websocket.send(json.dumps({
-                            "error": "No hay juego activo."
-                        }))
+                comando_actual.set(etiqueta_comando(datos))
                 
-                elif comando == "ENCONTRAR":
-                
-                    if sesion.juego_id:
-                        palabra = datos.get("palabra", "").upper()
-                        respuesta = actualizar_progreso(sesion.juego_id, palabra)
-                        datos_respuesta = json.loads(respuesta)
-                        
-                        await websocket.send(respuesta)
-                        
-                        palabras_encontradas = len(datos_respuesta.get('palabras_encontradas', []))
-                        total = datos_respuesta.get('total_palabras', 0)
-                        print(f"✓ Palabra encontrada: {palabra} ({palabras_encontradas}/{total})")
-                        
-                        if datos_respuesta.get('completado', False):
-                            print(f"🎉 ¡Juego completado! (Cliente: {sesion.cliente_id})")
-                    else:
-                        await websocket.send(json.dumps({
-                            "error": "No hay juego activo"
-                        }))
-                
-                elif comando == "ESTADO":
-                    if sesion.juego_id:
-                        respuesta = obtener_estado_juego(sesion.juego_id)
-                        await websocket.send(respuesta)
-                    else:
-                        await websocket.send(json.dumps({
-                            "error": "No hay juego activo"
-                        }))
+                if isinstance(datos, list):
+                    respuesta = await procesar_lote(sesion, datos)
+                else:
+                    respuesta = await procesar_mensaje(sesion, datos, websocket.send)
                 
-                elif comando == "ESTADISTICAS":
-                    respuesta = obtener_estadisticas()
+                if respuesta is not None:
                     await websocket.send(respuesta)
-                
-                else:
-                    await websocket.send(json.dumps({
-                        "error": f"Comando desconocido: {comando}"
-                    }))
                     
             except json.JSONDecodeError:
-                await websocket.send(json.dumps({
-                    "error": "Formato de mensaje inválido"
-                }))
+                if sesion.limitador.permitir_mensaje():
+                    respuesta = json.dumps({
+                        "error": "Formato de mensaje inválido"
+                    })
+                else:
+                    comando_actual.set("RECHAZO")
+                    respuesta = rechazo_por_limite(sesion, "*")
+                await websocket.send(respuesta)
+            finally:
+                sesion.en_curso = False
+        
+        if apagando:
+            await websocket.close(CODIGO_APAGADO, MOTIVO_APAGADO)
     
-    except websockets.exceptions.ConnectionClosed:
+    except websockets.exceptions.ConnectionClosed as e:
+        if e.sent is not None and e.sent.code == 1009:
+            estadisticas_servidor["mensajes_demasiado_grandes"] += 1
+            print(f"✗ Mensaje demasiado grande (ID: {sesion.cliente_id})")
         print(f"✗ Cliente desconectado (ID: {sesion.cliente_id})")
     
     except Exception as e:
@@ -139,39 +554,254 @@ async def handler(websocket):
         eliminar_sesion(websocket)
         print(f"   Total sesiones activas: {len(sesiones_activas)}")
 
-async def main():
-    """Inicia el servidor WebSocket"""
-    print("=" * 60)
-    print("🎮 SERVIDOR DE SOPA DE LETRAS")
-    print("=" * 60)
-    print(f"📊 Storage inicializado con {len(storage.palabras)} palabras")
-    print(f"🚀 Servidor WebSocket escuchando en ws://{HOST}:{PORT}")
-    print("=" * 60)
-    print("\n✅ Servidor listo para recibir conexiones del frontend")
-    print("   - Los comandos se envían automáticamente desde la interfaz web")
-    print("   - No se requiere interacción manual del usuario")
-    print("\nPresiona Ctrl+C para detener el servidor\n")
-    print("=" * 60)
-    
-    async with websockets.serve(handler, HOST, PORT):
-        await asyncio.Future()  
+def restaurar_estado(archivo_db=None, snapshot=None, archivo_tableros=None, checkpoint=None):
+    """Importa la lógica del juego, elige el backend y carga el snapshot y el checkpoint si existen"""
+    game_logic = logica()
+    if archivo_db:
+        from sqlite_storage import SQLiteStorage
+        game_logic.configurar_storage(SQLiteStorage(archivo_db))
+        return game_logic.storage
+    
+    if archivo_tableros:
+        from archivo_tableros import ArchivoTableros
+        archivo = ArchivoTableros(archivo_tableros)
+        game_logic.storage.configurar_archivo(archivo, TABLEROS_EN_MEMORIA)
+        print(f"🗄️ Archivo de tableros {archivo_tableros} ({len(archivo)} tableros históricos)")
+    if snapshot and game_logic.storage.cargar_snapshot(snapshot):
+        print(f"♻️ Snapshot restaurado desde {snapshot} "
+              f"({len(game_logic.storage.listar_tableros())} tableros)")
+    if checkpoint:
+        registros = game_logic.storage.cargar_checkpoint(checkpoint)
+        if registros:
+            print(f"♻️ Checkpoint restaurado desde {checkpoint} ({registros} registros)")
+    return game_logic.storage
 
-if __name__ == "__main__":
+async def restaurar_en_segundo_plano(archivo_db=None, snapshot=None, archivo_tableros=None, checkpoint=None):
+    """Restaura el estado en un hilo mientras el servidor ya acepta conexiones"""
+    inicio = time.perf_counter()
+    try:
+        storage = await asyncio.to_thread(restaurar_estado, archivo_db, snapshot, archivo_tableros, checkpoint)
+        print(f"📊 Storage inicializado con {len(storage.obtener_palabras())} palabras")
+    except Exception as e:
+        print(f"⚠️ Error al restaurar el estado: {e}")
+    finally:
+        estadisticas_servidor["arranque"]["restauracion_ms"] = round((time.perf_counter() - inicio) * 1000, 1)
+        restauracion_lista.set()
+
+def guardar_estado(checkpoint=None, snapshot=None):
+    """Escribe el checkpoint incremental y el snapshot (en un hilo); retorna los registros escritos"""
+    if _game_logic is None:
+        return 0
+    storage = _game_logic.storage
+    registros = 0
+    if hasattr(storage, "esperar_archivado"):
+        # Un registro a medio escribir desalinearía el archivo de tableros
+        storage.esperar_archivado()
+    if checkpoint and hasattr(storage, "guardar_checkpoint"):
+        registros = storage.guardar_checkpoint(checkpoint)
+    if snapshot and hasattr(storage, "guardar_snapshot"):
+        storage.guardar_snapshot(snapshot, SNAPSHOT_TABLEROS_RECIENTES)
+    return registros
+
+async def checkpoint_periodico(checkpoint, intervalo=INTERVALO_CHECKPOINT):
+    """Mantiene pequeño el checkpoint final escribiendo los cambios cada `intervalo` segundos"""
+    while True:
+        await asyncio.sleep(intervalo)
+        if restauracion_lista is not None and not restauracion_lista.is_set():
+            continue
+        try:
+            await asyncio.to_thread(guardar_estado, checkpoint)
+        except Exception as e:
+            print(f"⚠️ Error al escribir el checkpoint: {e}")
+
+async def apagar_servidor(servidor, checkpoint=None, snapshot=None, plazo=PLAZO_APAGADO,
+                          plazo_guardado=PLAZO_GUARDADO):
+    """
+    Apagado ordenado: deja de aceptar conexiones, termina los comandos en curso
+    (como mucho `plazo` segundos) y cierra los sockets con 1001 mientras el
+    checkpoint se escribe en segundo plano. El snapshot se escribe al final,
+    cuando ya no queda ningún comando en curso; la espera por el guardado está
+    acotada por `plazo_guardado`.
+    """
+    global apagando
+    inicio = time.perf_counter()
+    resumen = estadisticas_servidor["apagado"]
+    apagando = True
+    
+    # Sin cerrar conexiones: solo deja de aceptar nuevas
+    servidor.close(close_connections=False)
+    guardado = asyncio.create_task(asyncio.to_thread(guardar_estado, checkpoint))
+    
+    # Las sesiones ociosas se cierran ya; las ocupadas se cierran solas al responder
+    resumen["comandos_drenados"] = sum(1 for s in sesiones_activas if s.en_curso)
+    for sesion in list(sesiones_activas):
+        if not sesion.en_curso:
+            asyncio.create_task(sesion.websocket.close(CODIGO_APAGADO, MOTIVO_APAGADO))
+    
+    try:
+        await asyncio.wait_for(servidor.wait_closed(), plazo)
+    except asyncio.TimeoutError:
+        resumen["conexiones_forzadas"] = len(sesiones_activas)
+        print(f"⚠️ Plazo de {plazo}s agotado: se cortan {len(sesiones_activas)} conexiones")
+        for sesion in list(sesiones_activas):
+            sesion.websocket.transport.abort()
+        await asyncio.wait_for(servidor.wait_closed(), 1.0)
+    fin_drenaje = time.perf_counter()
+    resumen["drenaje_ms"] = round((fin_drenaje - inicio) * 1000, 1)
+    
+    async def guardar_todo():
+        registros = await guardado
+        # Segunda pasada: cambios hechos por los comandos drenados, y el snapshot ya completo
+        return registros + await asyncio.to_thread(guardar_estado, checkpoint, snapshot)
+    
     try:
-        asyncio.run(main())
+        resumen["registros_checkpoint"] = await asyncio.wait_for(guardar_todo(), plazo_guardado)
+    except asyncio.TimeoutError:
+        # El hilo no se interrumpe (dejaría archivos a medias): termina antes de que salga el proceso
+        resumen["guardado_vencido"] = True
+        print(f"⚠️ Plazo de {plazo_guardado}s agotado al guardar el estado; se completa al salir")
+    except Exception as e:
+        print(f"⚠️ Error al guardar el estado: {e}")
+    # Solo lo que el guardado añade tras el drenaje (la primera pasada corre durante él)
+    fin = time.perf_counter()
+    resumen["checkpoint_ms"] = round((fin - fin_drenaje) * 1000, 1)
+    resumen["total_ms"] = round((fin - inicio) * 1000, 1)
+    return resumen
+
+async def main(host=HOST, port=PORT, reuse_port=False, archivo_db=None, snapshot=None,
+               archivo_tableros=None, checkpoint=None, compresion=COMPRESION):
+    """Inicia el servidor WebSocket; SIGINT/SIGTERM disparan el apagado ordenado"""
+    global restauracion_lista
+    restauracion_lista = asyncio.Event()
+    
+    detener = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for senal in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(senal, detener.set)
+        except NotImplementedError:
+            pass  # Windows: Ctrl+C llega como KeyboardInterrupt
+    
+    # compression=None: la única extensión es la nuestra (o ninguna si está desactivada)
+    extensiones = crear_extensiones(compresion, metricas_compresion)
+    
+    async with websockets.serve(handler, host, port, reuse_port=reuse_port,
+                                max_size=MAX_MESSAGE_SIZE, max_queue=MAX_PENDING_MESSAGES,
+                                compression=None, extensions=extensiones) as servidor:
+        escucha_ms = round((time.perf_counter() - _INICIO_PROCESO) * 1000, 1)
+        estadisticas_servidor["arranque"]["escucha_ms"] = escucha_ms
+        restauracion = asyncio.create_task(
+            restaurar_en_segundo_plano(archivo_db, snapshot, archivo_tableros, checkpoint))
+        
+        print("=" * 60)
+        print("🎮 SERVIDOR DE SOPA DE LETRAS")
+        print("=" * 60)
+        print(f"🚀 Servidor WebSocket escuchando en ws://{host}:{port} (PID {os.getpid()})")
+        print(f"⏱ Aceptando conexiones {escucha_ms} ms después de arrancar")
+        print("=" * 60)
+        print("\n✅ Servidor listo para recibir conexiones del frontend")
+        print("   - Los comandos se envían automáticamente desde la interfaz web")
+        print("   - No se requiere interacción manual del usuario")
+        print("\nPresiona Ctrl+C para detener el servidor\n")
+        print("=" * 60)
+        
+        periodico = asyncio.create_task(checkpoint_periodico(checkpoint)) if checkpoint else None
+        await detener.wait()
+        
+        print("\n⏹ Apagando: se terminan los comandos en curso...")
+        if periodico:
+            periodico.cancel()
+        restauracion.cancel()
+        return await apagar_servidor(servidor, checkpoint, snapshot)
+
+def ejecutar_worker(host, port, archivo_db, compresion=COMPRESION):
+    """Proceso worker: comparte el puerto (SO_REUSEPORT) y el storage SQLite; sin salas"""
+    global salas_habilitadas
+    salas_habilitadas = False
+    try:
+        resumen = asyncio.run(main(host, port, reuse_port=True, archivo_db=archivo_db, compresion=compresion))
+        print(f"⏹ Worker {os.getpid()} apagado en {resumen['total_ms']} ms")
     except KeyboardInterrupt:
+        pass
+
+def ejecutar_multiproceso(host, port, workers, archivo_db, compresion=COMPRESION):
+    """Lanza varios workers aceptando conexiones en el mismo puerto"""
+    import multiprocessing
+    from sqlite_storage import SQLiteStorage
+    # Crea el esquema antes de arrancar los workers
+    SQLiteStorage(archivo_db).cerrar()
+
+    procesos = [
+        multiprocessing.Process(target=ejecutar_worker, args=(host, port, archivo_db, compresion), daemon=True)
+        for _ in range(workers)
+    ]
+    for proceso in procesos:
+        proceso.start()
+
+    try:
+        for proceso in procesos:
+            proceso.join()
+    except KeyboardInterrupt:
+        for proceso in procesos:
+            proceso.join(timeout=PLAZO_APAGADO + 2)
+            if proceso.is_alive():
+                proceso.terminate()
         print("\n" + "=" * 60)
-        print("⏹ Servidor detenido correctamente")
-        print(f"📈 Estadísticas finales: {storage.obtener_estadisticas()}")
+        print(f"⏹ {workers} workers detenidos; datos persistidos en {archivo_db}")
         print("=" * 60)
-        
 
+def parsear_argumentos(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Servidor WebSocket de Sopa de Letras")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--puerto", type=int, default=PORT)
+    parser.add_argument("--workers", type=int, default=1,
+                        help="procesos worker; con más de 1 se usa SQLite compartido y no hay salas (UNIRSE)")
+    parser.add_argument("--db", default=None,
+                        help="archivo SQLite (WAL) para el storage compartido")
+    parser.add_argument("--snapshot", default=SNAPSHOT_ARCHIVO,
+                        help="snapshot binario a cargar al arrancar y guardar al salir")
+    parser.add_argument("--archivo-tableros", default=None,
+                        help="archivo (mmap) donde se guardan los tableros antiguos fuera de memoria")
+    parser.add_argument("--sin-compresion", action="store_true",
+                        help="desactiva per-message-deflate")
+    parser.add_argument("--umbral-compresion", type=int, default=COMPRESION["umbral"],
+                        help="bytes mínimos de un mensaje para comprimirlo")
+    parser.add_argument("--checkpoint", default=CHECKPOINT_ARCHIVO,
+                        help="archivo JSONL con los cambios: se anexan periódicamente y al apagar; "
+                             "se carga (y compacta si hace falta) al arrancar")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parsear_argumentos()
+    compresion = {**COMPRESION, "activa": not args.sin_compresion, "umbral": args.umbral_compresion}
+
+    if args.workers > 1:
+        ejecutar_multiproceso(args.host, args.puerto, args.workers, args.db or "sopa_letras.db", compresion)
+    else:
         try:
-            storage.exportar_datos()
-            print("💾 Datos exportados correctamente")
-        except Exception as e:
-            print(f"⚠️ Error al exportar datos: {e}")
+            resumen = asyncio.run(main(args.host, args.puerto, archivo_db=args.db, snapshot=args.snapshot,
+                                       archivo_tableros=args.archivo_tableros, checkpoint=args.checkpoint,
+                                       compresion=compresion))
+        except KeyboardInterrupt:
+            # Sin manejadores de señales (Windows): no hay drenaje, solo se guarda el estado
+            resumen = None
+            try:
+                guardar_estado(args.checkpoint, args.snapshot)
+            except Exception as e:
+                print(f"⚠️ Error al guardar el estado: {e}")
         
+        print("\n" + "=" * 60)
+        print("⏹ Servidor detenido correctamente")
+        if _game_logic is not None:
+            print(f"📈 Estadísticas finales: {_game_logic.storage.obtener_estadisticas()}")
+        if resumen:
+            print(f"⏱ Apagado en {resumen['total_ms']} ms "
+                  f"(drenaje {resumen['drenaje_ms']} ms, guardado {resumen['checkpoint_ms']} ms, "
+                  f"{resumen['comandos_drenados']} comandos en curso, "
+                  f"{resumen['conexiones_forzadas']} conexiones cortadas)")
+            print(f"💾 Checkpoint: {resumen['registros_checkpoint']} registros en {args.checkpoint}; "
+                  f"snapshot en {args.snapshot}")
         print("=" * 60)
         print("👋 ¡Hasta luego!")
-        print("=" * 60)
\ No newline at end of file
+        print("=" * 60)